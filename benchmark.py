@@ -0,0 +1,201 @@
+"""Run solvers over generated inputs of growing size to see how they scale."""
+import argparse
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import NamedTuple
+
+from generators import GENERATORS, generate
+from input_cache import OVERRIDE_DIR_ENV, load_input
+from run_solution import PUZZLE_DIR, find_puzzles, get_solver_class
+
+
+DEFAULT_SIZES = {
+    1: [1_000, 10_000, 100_000],
+    2: [1_000, 10_000, 100_000],
+    3: [50, 150, 450],
+    4: [1_000, 10_000, 100_000],
+    5: [10, 100, 1_000],
+    6: [4, 16, 64],
+    7: [1_000, 10_000, 100_000],
+    8: [1_000, 10_000, 100_000],
+    9: [1_000, 10_000, 100_000],
+    10: [15, 30, 60],
+    11: [50, 100, 200],
+}
+
+
+class BenchmarkResult(NamedTuple):
+    problem_number: int
+    part: int
+    size: int
+    seconds: float = math.nan
+    peak_bytes: int = 0
+    error: str | None = None
+
+
+class ImportResult(NamedTuple):
+    module: str
+    seconds: float
+    # the heaviest modules imported directly by `module`, with their cumulative seconds
+    heaviest: list[tuple[str, float]]
+
+
+def benchmark(
+    problem_number: int,
+    part: int,
+    sizes: list[int],
+    max_seconds: float | None = None,
+    seed: int = 0,
+) -> list[BenchmarkResult]:
+    """
+    Time one solver over each size, and measure its peak traced memory in a separate run.
+
+    Sizes are visited in increasing order, and the sweep stops after the first size whose run
+    takes longer than `max_seconds` or raises.
+    """
+    # import the solver up front, so the first size isn't charged for loading its module
+    solver_class = get_solver_class(problem_number)
+    results = []
+    previous_override = os.environ.get(OVERRIDE_DIR_ENV)
+    with tempfile.TemporaryDirectory() as input_dir:
+        os.environ[OVERRIDE_DIR_ENV] = input_dir
+        try:
+            for size in sorted(sizes):
+                Path(input_dir, f"puzzle_{problem_number}.txt").write_text(
+                    generate(problem_number, size, seed=seed)
+                )
+                load_input.cache_clear()
+
+                try:
+                    start = time.perf_counter()
+                    solver_class(part).run()
+                    seconds = time.perf_counter() - start
+
+                    tracemalloc.start()
+                    try:
+                        solver_class(part).run()
+                        _, peak_bytes = tracemalloc.get_traced_memory()
+                    finally:
+                        tracemalloc.stop()
+                except Exception as e:
+                    results.append(BenchmarkResult(problem_number, part, size, error=repr(e)))
+                    break
+
+                results.append(BenchmarkResult(problem_number, part, size, seconds, peak_bytes))
+                if max_seconds is not None and seconds > max_seconds:
+                    break
+        finally:
+            load_input.cache_clear()
+            if previous_override is None:
+                os.environ.pop(OVERRIDE_DIR_ENV)
+            else:
+                os.environ[OVERRIDE_DIR_ENV] = previous_override
+    return results
+
+
+def scaling_exponent(smaller: BenchmarkResult, larger: BenchmarkResult) -> float:
+    """k such that time grows like size ** k between two runs, e.g. ~2 for a quadratic hot path."""
+    if smaller.seconds <= 0 or larger.size == smaller.size:
+        return math.nan
+    return math.log(larger.seconds / smaller.seconds) / math.log(larger.size / smaller.size)
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    header = ("puzzle", "size", "time (s)", "peak (MiB)", "exponent")
+    rows = []
+    for previous, result in zip([None, *results], results):
+        same_sweep = previous is not None and previous[:2] == result[:2]
+        rows.append((
+            f"{result.problem_number}.{result.part}",
+            str(result.size),
+            *(
+                (
+                    f"{result.seconds:.4f}",
+                    f"{result.peak_bytes / 2 ** 20:.2f}",
+                    f"{scaling_exponent(previous, result):.2f}" if same_sweep else "",
+                )
+                if result.error is None
+                else ("failed", "", result.error)
+            ),
+        ))
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.rjust(width) for cell, width in zip(row, widths))
+        for row in [header, *rows]
+    )
+
+
+def import_time(module: str, top_n: int = 3) -> ImportResult:
+    """Cumulative import time of a module in a fresh interpreter, as reported by -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PUZZLE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # lines look like "import time:   self [us] | cumulative |   package", indented by depth
+    children = []
+    seconds = math.nan
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("imported package"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0 and name.strip() == module:
+            seconds = int(cumulative) / 1e6
+        elif depth == 1:
+            children.append((name.strip(), int(cumulative) / 1e6))
+    # a module's children are listed before it, and only the last module at depth 0 is ours
+    return ImportResult(module, seconds, sorted(children, key=lambda c: c[1], reverse=True)[:top_n])
+
+
+def format_import_results(results: list[ImportResult]) -> str:
+    return "\n".join(
+        f"{result.module:>10}  {result.seconds * 1e3:8.1f} ms  "
+        + ", ".join(f"{name} {seconds * 1e3:.1f} ms" for name, seconds in result.heaviest)
+        for result in results
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark solvers on generated inputs.")
+    parser.add_argument("problems", nargs="*", type=int, default=sorted(GENERATORS))
+    parser.add_argument("--parts", nargs="+", type=int, default=[1, 2])
+    parser.add_argument("--sizes", nargs="+", type=int, default=None, help="override the default sizes")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="stop growing a sweep past this time")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--imports", action="store_true", help="report import times instead of solve times")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="fail if any module imports slower")
+    args = parser.parse_args()
+
+    if args.imports:
+        problems = args.problems if args.problems != sorted(GENERATORS) else find_puzzles()
+        results = [import_time(f"puzzle_{problem_number}") for problem_number in problems]
+        print(format_import_results(results))
+        if args.max_import_ms is not None:
+            slow = [result.module for result in results if result.seconds * 1e3 > args.max_import_ms]
+            if slow:
+                sys.exit(f"imports slower than {args.max_import_ms} ms: {', '.join(slow)}")
+        return
+
+    for problem_number in args.problems:
+        for part in args.parts:
+            results = benchmark(
+                problem_number,
+                part,
+                args.sizes or DEFAULT_SIZES[problem_number],
+                max_seconds=args.max_seconds,
+                seed=args.seed,
+            )
+            print(format_results(results), end="\n\n", flush=True)
+
+
+if __name__ == '__main__':
+    main()
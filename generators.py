@@ -0,0 +1,300 @@
+"""Synthetic puzzle inputs of arbitrary size, in the same format as the official ones."""
+import math
+import random
+import string
+from collections.abc import Callable
+
+
+DIGIT_NAMES = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+CARD_LABELS = "23456789TJQKA"
+SYMBOLS = "*#+$/@=%&-"
+PIPES = "|-LJ7F."
+
+
+def generate_puzzle_1(size: int, rng: random.Random) -> str:
+    """`size` calibration lines, each holding at least one numeric digit."""
+    def line():
+        parts = [
+            rng.choice(DIGIT_NAMES)
+            if (roll := rng.random()) < 0.2
+            else str(rng.randint(1, 9))
+            if roll < 0.35
+            else "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 4)))
+            for _ in range(rng.randint(2, 8))
+        ]
+        parts.insert(rng.randint(0, len(parts)), str(rng.randint(1, 9)))
+        return "".join(parts)
+
+    return "\n".join(line() for _ in range(size))
+
+
+def generate_puzzle_2(size: int, rng: random.Random) -> str:
+    """`size` games of two to six turns each."""
+    def turn():
+        colors = rng.sample(["red", "green", "blue"], k=rng.randint(1, 3))
+        return ", ".join(f"{rng.randint(1, 20)} {color}" for color in colors)
+
+    return "\n".join(
+        f"Game {number}: " + "; ".join(turn() for _ in range(rng.randint(2, 6)))
+        for number in range(1, size + 1)
+    )
+
+
+def generate_puzzle_3(size: int, rng: random.Random) -> str:
+    """A `size` x `size` engine schematic of numbers and symbols."""
+    rows = []
+    for _ in range(size):
+        row = []
+        while len(row) < size:
+            roll = rng.random()
+            if roll < 0.08:
+                row.extend(str(rng.randint(1, 999)))
+                row.append(".")
+            elif roll < 0.12:
+                row.append(rng.choice(SYMBOLS))
+            else:
+                row.append(".")
+        rows.append("".join(row[:size]))
+    return "\n".join(rows)
+
+
+def generate_puzzle_4(size: int, rng: random.Random) -> str:
+    """`size` scratchcards with 10 winning numbers and 25 numbers of mine."""
+    lines = []
+    for number in range(1, size + 1):
+        # keeping the expected match count below one keeps part 2's copy counts bounded
+        matches = min(
+            0 if rng.random() < 0.7 else rng.randint(1, 2),
+            size - number,
+        )
+        winning = rng.sample(range(1, 100), k=10)
+        others = rng.sample([n for n in range(1, 100) if n not in winning], k=25 - matches)
+        mine = winning[:matches] + others
+        rng.shuffle(mine)
+        lines.append(
+            f"Card {number:>{len(str(size))}}: "
+            + " ".join(f"{n:>2}" for n in winning)
+            + " | "
+            + " ".join(f"{n:>2}" for n in mine)
+        )
+    return "\n".join(lines)
+
+
+def generate_puzzle_5(size: int, rng: random.Random) -> str:
+    """`size` seed ranges and seven maps of `size` ranges each."""
+    span = 1 << 32
+
+    def cut_points(count):
+        return sorted(rng.sample(range(1, span), k=count))
+
+    points = cut_points(2 * size)
+    seeds = " ".join(
+        f"{start} {stop - start}"
+        for start, stop in zip(points[::2], points[1::2])
+    )
+
+    names = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+    maps = []
+    for source, destination in zip(names, names[1:]):
+        bounds = [0, *cut_points(size), span]
+        rows = [
+            f"{rng.randrange(span - (stop - start))} {start} {stop - start}"
+            for start, stop in zip(bounds, bounds[1:])
+            if rng.random() < 0.8
+        ]
+        rng.shuffle(rows)
+        maps.append(f"{source}-to-{destination} map:\n" + "\n".join(rows))
+
+    return f"seeds: {seeds}\n\n" + "\n\n".join(maps)
+
+
+def generate_puzzle_6(size: int, rng: random.Random) -> str:
+    """`size` races, each with a beatable record."""
+    times = [rng.randint(10, 100) for _ in range(size)]
+    records = [rng.randint(1, (time // 2) * (time - time // 2) - 1) for time in times]
+    return (
+        "Time:    " + " ".join(f"{time:>4}" for time in times)
+        + "\nDistance:" + " ".join(f"{record:>4}" for record in records)
+    )
+
+
+def generate_puzzle_7(size: int, rng: random.Random) -> str:
+    """`size` hands with bids."""
+    return "\n".join(
+        f"{''.join(rng.choices(CARD_LABELS, k=5))} {rng.randint(1, 1000)}"
+        for _ in range(size)
+    )
+
+
+def generate_puzzle_8(size: int, rng: random.Random) -> str:
+    """
+    A map of roughly `size` nodes.
+
+    Like the official inputs, every node ending in A leads into a cycle whose only Z node is
+    reached after a whole number of passes over the directions, and first reached after exactly
+    one cycle length. AAA's cycle ends in ZZZ.
+    """
+    primes = [43, 47, 53, 59, 61, 67]
+    instruction_length = max(1, size // (2 * sum(primes)))
+    directions = "".join(rng.choices("LR", k=instruction_length))
+
+    name_length = max(4, math.ceil(math.log(size + 1, 26)) + 1)
+    counter = iter(range(26 ** (name_length - 1)))
+
+    def new_name(suffix):
+        number, name = next(counter), []
+        for _ in range(name_length - 1):
+            number, digit = divmod(number, 26)
+            name.append(string.ascii_uppercase[digit])
+        return "".join(name) + suffix
+
+    def filler_name():
+        return new_name(rng.choice(string.ascii_uppercase[1:-1]))
+
+    edges = {}
+    for i, prime in enumerate(primes):
+        start = "AAA" if i == 0 else new_name("A")
+        cycle = [filler_name() for _ in range(prime * instruction_length - 1)]
+        cycle.append("ZZZ" if i == 0 else new_name("Z"))
+        edges[start] = (cycle[0], cycle[0])
+        for node, next_node in zip(cycle, cycle[1:] + cycle[:1]):
+            edges[node] = (next_node, next_node)
+
+    fillers = [filler_name() for _ in range(max(1, size - len(edges)))]
+    for node in fillers:
+        edges[node] = (rng.choice(fillers), rng.choice(fillers))
+
+    lines = [f"{node} = ({left}, {right})" for node, (left, right) in edges.items()]
+    rng.shuffle(lines)
+    return directions + "\n\n" + "\n".join(lines)
+
+
+def generate_puzzle_9(size: int, rng: random.Random) -> str:
+    """`size` sequences of 21 values, each a polynomial of degree at most 6."""
+    def sequence():
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 7))]
+        return " ".join(
+            str(sum(c * x ** power for power, c in enumerate(coefficients)))
+            for x in range(21)
+        )
+
+    return "\n".join(sequence() for _ in range(size))
+
+
+def generate_puzzle_10(size: int, rng: random.Random) -> str:
+    """
+    A `size` x `size` pipe map, rounded down to a multiple of 3.
+
+    The grid is split into 3 x 3 blocks, and a random tree is grown over most of them. Each
+    block in the tree starts as a ring of 8 pipes around its center tile, and each tree edge
+    splices the rings of two neighboring blocks together, so the result is one loop enclosing
+    every tree block's center. All other tiles are random junk.
+    """
+    blocks = max(1, size // 3)
+    height = width = 3 * blocks
+
+    links = {}
+
+    def link(a, b):
+        links.setdefault(a, set()).add(b)
+        links.setdefault(b, set()).add(a)
+
+    def unlink(a, b):
+        links[a].discard(b)
+        links[b].discard(a)
+
+    def add_ring(br, bc):
+        ring = [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0), (1, 0)]
+        cells = [(3 * br + r, 3 * bc + c) for r, c in ring]
+        for a, b in zip(cells, cells[1:] + cells[:1]):
+            link(a, b)
+
+    root = (blocks // 2, blocks // 2)
+    in_tree = {root}
+    add_ring(*root)
+    steps = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    frontier = [(root, (root[0] + dr, root[1] + dc)) for dr, dc in steps]
+    target = max(1, int(0.6 * blocks * blocks))
+
+    while frontier and len(in_tree) < target:
+        i = rng.randrange(len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        parent, block = frontier.pop()
+        if block in in_tree or not (0 <= block[0] < blocks and 0 <= block[1] < blocks):
+            continue
+        in_tree.add(block)
+        add_ring(*block)
+
+        (upper, left), (lower, right) = sorted([parent, block])
+        if upper == lower:
+            # splice horizontally neighboring rings along their top two rows
+            r, c = 3 * upper, 3 * right
+            unlink((r, c - 1), (r + 1, c - 1))
+            unlink((r, c), (r + 1, c))
+            link((r, c - 1), (r, c))
+            link((r + 1, c - 1), (r + 1, c))
+        else:
+            # splice vertically neighboring rings along their left two columns
+            r, c = 3 * lower, 3 * left
+            unlink((r - 1, c), (r - 1, c + 1))
+            unlink((r, c), (r, c + 1))
+            link((r - 1, c), (r, c))
+            link((r - 1, c + 1), (r, c + 1))
+
+        br, bc = block
+        frontier += [(block, (br + dr, bc + dc)) for dr, dc in steps]
+
+    shapes = {
+        frozenset([(-1, 0), (1, 0)]): "|",
+        frozenset([(0, -1), (0, 1)]): "-",
+        frozenset([(-1, 0), (0, 1)]): "L",
+        frozenset([(-1, 0), (0, -1)]): "J",
+        frozenset([(1, 0), (0, -1)]): "7",
+        frozenset([(1, 0), (0, 1)]): "F",
+    }
+    grid = [[rng.choice(PIPES) for _ in range(width)] for _ in range(height)]
+    for (r, c), neighbors in links.items():
+        grid[r][c] = shapes[frozenset((nr - r, nc - c) for nr, nc in neighbors)]
+
+    # start on an inner loop tile, and keep junk from pointing into it
+    start_r, start_c = min(links, key=lambda cell: (cell[0] < 1 or cell[1] < 1, cell))
+    grid[start_r][start_c] = "S"
+    for dr, dc in steps:
+        neighbor = (start_r + dr, start_c + dc)
+        if neighbor not in links[start_r, start_c] and 0 <= neighbor[0] < height and 0 <= neighbor[1] < width:
+            if neighbor not in links:
+                grid[neighbor[0]][neighbor[1]] = "."
+
+    return "\n".join("".join(row) for row in grid)
+
+
+def generate_puzzle_11(size: int, rng: random.Random) -> str:
+    """A `size` x `size` image with about 2% galaxies and some guaranteed empty rows and columns."""
+    empty_rows = set(rng.sample(range(size), k=size // 10))
+    empty_columns = set(rng.sample(range(size), k=size // 10))
+    return "\n".join(
+        "".join(
+            "#" if r not in empty_rows and c not in empty_columns and rng.random() < 0.02 else "."
+            for c in range(size)
+        )
+        for r in range(size)
+    )
+
+
+GENERATORS: dict[int, Callable[[int, random.Random], str]] = {
+    1: generate_puzzle_1,
+    2: generate_puzzle_2,
+    3: generate_puzzle_3,
+    4: generate_puzzle_4,
+    5: generate_puzzle_5,
+    6: generate_puzzle_6,
+    7: generate_puzzle_7,
+    8: generate_puzzle_8,
+    9: generate_puzzle_9,
+    10: generate_puzzle_10,
+    11: generate_puzzle_11,
+}
+
+
+def generate(problem_number: int, size: int, seed: int = 0) -> str:
+    return GENERATORS[problem_number](size, random.Random(seed))
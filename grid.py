@@ -0,0 +1,118 @@
+"""Character grids held as uint8 arrays, shared by the map-based puzzles."""
+from pathlib import Path
+
+import numpy as np
+
+from input_cache import MMAP_THRESHOLD, input_path, load_input
+from numeric_parsing import as_bytes
+
+
+NEIGHBORS_4 = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+NEIGHBORS_8 = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+
+class Grid:
+    """
+    A rectangular grid of characters, viewed straight out of its text.
+
+    `buffer` is the text as flat uint8s, rows separated by newlines, so a cell's flat index is
+    row * stride + column and a step off either side lands on a newline rather than another
+    row. `cells` is an (h, w) view of the same memory without the newlines.
+    """
+
+    def __init__(self, buffer: np.ndarray):
+        # trailing newlines aren't part of the grid, and the last row may not have one
+        end = len(buffer)
+        while end and buffer[end - 1] == ord("\n"):
+            end -= 1
+        self.buffer = buffer[:end]
+
+        newlines = np.flatnonzero(self.buffer == ord("\n"))
+        self.width = int(newlines[0]) if len(newlines) else end
+        self.stride = self.width + 1
+        self.height = (end + 1) // self.stride if end else 0
+        if end and ((end + 1) % self.stride or len(newlines) != self.height - 1):
+            raise ValueError("grid rows are not all the same width")
+        self.cells = np.lib.stride_tricks.as_strided(
+            self.buffer, (self.height, self.width), (self.stride, 1), writeable=False
+        )
+
+    def __repr__(self):
+        return f"Grid({self.height}x{self.width})"
+
+    @classmethod
+    def from_text(cls, content: str | bytes) -> "Grid":
+        return cls(as_bytes(content))
+
+    @classmethod
+    def from_file(cls, path: Path) -> "Grid":
+        """A grid over a file, memory-mapped when it is large."""
+        if path.stat().st_size >= MMAP_THRESHOLD:
+            return cls(np.memmap(path, dtype=np.uint8, mode="r"))
+        return cls(np.fromfile(path, dtype=np.uint8))
+
+    @classmethod
+    def load(cls, year: int, day: int) -> "Grid":
+        """A day's input as a grid, read from disk without decoding it when it is stored locally."""
+        if (path := input_path(year, day)) is not None:
+            return cls.from_file(path)
+        return cls.from_text(load_input(year, day))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.height, self.width
+
+    def flat_index(self, r: int, c: int) -> int:
+        return r * self.stride + c
+
+    def position(self, index: int) -> tuple[int, int]:
+        r, c = divmod(index, self.stride)
+        return r, c
+
+    def flat_offsets(self, neighborhood=NEIGHBORS_4) -> list[int]:
+        """The change in flat index for each (dr, dc) in `neighborhood`."""
+        return [dr * self.stride + dc for dr, dc in neighborhood]
+
+    def in_bounds(self, r: int, c: int) -> bool:
+        return 0 <= r < self.height and 0 <= c < self.width
+
+    def mask(self, chars: str) -> np.ndarray:
+        """Cells holding any of `chars`."""
+        table = np.zeros(256, dtype=bool)
+        table[list(as_bytes(chars))] = True
+        return table[self.cells]
+
+    def find_all(self, chars: str) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and columns of every cell holding any of `chars`, in reading order."""
+        return np.nonzero(self.mask(chars))
+
+    def find(self, char: str) -> tuple[int, int] | None:
+        """The first cell holding `char`, in reading order."""
+        index = int(np.argmax(self.buffer == ord(char)))
+        if self.buffer[index] != ord(char):
+            return None
+        return self.position(index)
+
+    def rows_without(self, chars: str) -> np.ndarray:
+        """Whether each row has none of `chars`."""
+        return ~self.mask(chars).any(axis=1)
+
+    def columns_without(self, chars: str) -> np.ndarray:
+        """Whether each column has none of `chars`."""
+        return ~self.mask(chars).any(axis=0)
+
+    def neighbor_masks(self, mask: np.ndarray, neighborhood=NEIGHBORS_8):
+        """
+        For each (dr, dc) in `neighborhood`, at most one step each way, whether the cell that far
+        from each cell is in `mask`.
+        """
+        padded = np.pad(mask, 1)
+        for dr, dc in neighborhood:
+            yield padded[1 + dr:1 + dr + self.height, 1 + dc:1 + dc + self.width]
+
+    def dilate(self, mask: np.ndarray, neighborhood=NEIGHBORS_8) -> np.ndarray:
+        """Cells that are in `mask`, or next to a cell in it."""
+        dilated = mask.copy()
+        for shifted in self.neighbor_masks(mask, neighborhood):
+            dilated |= shifted
+        return dilated
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+
+YEAR = 2023
+
+# Directory checked before anything else, holding plain `puzzle_<day>.txt` files.
+OVERRIDE_DIR_ENV = "AOC23_INPUT_DIR"
+# Root of the content-addressed store that aocd fetches get written back to.
+CACHE_DIR_ENV = "AOC23_CACHE_DIR"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "aoc23"
+
+# Inputs at least this large are memory-mapped instead of read when loaded as a Grid.
+MMAP_THRESHOLD = 1 << 20
+
+
+def get_override_dir() -> Path | None:
+    override_dir = os.environ.get(OVERRIDE_DIR_ENV)
+    return Path(override_dir) if override_dir else None
+
+
+def get_cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR))
+
+
+def _index_path(year: int, day: int) -> Path:
+    return get_cache_dir() / "index" / str(year) / f"{day}.sha256"
+
+
+def _object_path(digest: str) -> Path:
+    return get_cache_dir() / "objects" / digest[:2] / digest
+
+
+def input_path(year: int, day: int) -> Path | None:
+    """Path of the on-disk input for a day, or None if it is not stored locally."""
+    if (override_dir := get_override_dir()) is not None:
+        override_path = override_dir / f"puzzle_{day}.txt"
+        if override_path.is_file():
+            return override_path
+
+    index_path = _index_path(year, day)
+    if index_path.is_file():
+        object_path = _object_path(index_path.read_text().strip())
+        if object_path.is_file():
+            return object_path
+    return None
+
+
+def store_input(year: int, day: int, content: str) -> Path:
+    """Write content to the store under its sha256 and point the (year, day) index at it."""
+    data = content.encode()
+    digest = hashlib.sha256(data).hexdigest()
+
+    object_path = _object_path(digest)
+    if not object_path.is_file():
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        # a temp file of its own, so concurrent writers never share a partly written one
+        with tempfile.NamedTemporaryFile(dir=object_path.parent, delete=False) as tmp:
+            tmp.write(data)
+        Path(tmp.name).replace(object_path)
+
+    index_path = _index_path(year, day)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path.write_text(digest)
+    return object_path
+
+
+@lru_cache(maxsize=32)
+def load_input(year: int, day: int) -> str:
+    """Raw puzzle input, read from disk when available and fetched via aocd otherwise."""
+    if (path := input_path(year, day)) is not None:
+        # match aocd, which strips trailing newlines from the data it returns
+        return path.read_bytes().decode().rstrip("\r\n")
+
+    from aocd import get_data
+
+    content = get_data(year=year, day=day)
+    store_input(year, day, content)
+    return content
@@ -0,0 +1,37 @@
+"""Vectorized parsing of the integers in a text buffer, without a Python object per number."""
+import numpy as np
+
+
+INT64_MAX = np.iinfo(np.int64).max
+# Longest run of digits parse_integers can read without overflowing an int64.
+MAX_INT64_DIGITS = 18
+
+
+def as_bytes(content: str | bytes) -> np.ndarray:
+    """Zero-copy uint8 view of bytes, or of the ASCII encoding of a str."""
+    return np.frombuffer(content.encode() if isinstance(content, str) else content, dtype=np.uint8)
+
+
+def parse_integers(buffer: np.ndarray, signed: bool = False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every run of decimal digits in a uint8 buffer, as int64 values with their [start, end) offsets.
+
+    With `signed`, a "-" directly before a run negates it. Runs must fit in an int64, which
+    those of at most MAX_INT64_DIGITS digits always do.
+    """
+    is_digit = np.concatenate([[False], (buffer >= ord("0")) & (buffer <= ord("9")), [False]])
+    starts = np.flatnonzero(is_digit[1:] & ~is_digit[:-1])
+    ends = np.flatnonzero(is_digit[:-1] & ~is_digit[1:])
+
+    # accumulate one digit place at a time, so memory scales with the count of numbers only
+    lengths = ends - starts
+    values = np.zeros(len(starts), dtype=np.int64)
+    for place in range(lengths.max(initial=0)):
+        active = np.flatnonzero(lengths > place)
+        values[active] = values[active] * 10 + (buffer[starts[active] + place] - ord("0"))
+
+    if signed:
+        has_sign = starts > 0
+        has_sign[has_sign] = buffer[starts[has_sign] - 1] == ord("-")
+        values[has_sign] *= -1
+    return values, starts, ends
@@ -1,51 +1,57 @@
 import re
+from collections.abc import Iterator
 
 from solver import Solver
 
 
+DIGIT_NAMES = {
+    # "zero": "0",
+    "one": "1",
+    "two": "2",
+    "three": "3",
+    "four": "4",
+    "five": "5",
+    "six": "6",
+    "seven": "7",
+    "eight": "8",
+    "nine": "9",
+}
+
+# The last digit is found by searching the reversed line for the reversed digit names, so
+# both ends of a line are found with a single search each and overlaps like "twone" just work.
+FIRST_DIGIT_PATTERNS = {
+    1: re.compile(r"\d"),
+    2: re.compile("|".join([r"\d", *DIGIT_NAMES])),
+}
+LAST_DIGIT_PATTERNS = {
+    1: re.compile(r"\d"),
+    2: re.compile("|".join([r"\d", *(name[::-1] for name in DIGIT_NAMES)])),
+}
+
 class Puzzle1Solver(Solver):
     def __init__(self, part: int = 1):
         super().__init__(1, part)
 
-    def process_input(self, content: str):
-        return content.splitlines()
+    def process_input(self, chunks: Iterator[str]) -> Iterator[list[str]]:
+        """Non-empty lines, a chunk at a time, since streaming them one by one costs more per line."""
+        return ([line for line in chunk.split("\n") if line] for chunk in chunks)
 
     @staticmethod
     def name_to_digit(digit_name: str) -> str:
-        return {
-            # "zero": "0",
-            "one": "1",
-            "two": "2",
-            "three": "3",
-            "four": "4",
-            "five": "5",
-            "six": "6",
-            "seven": "7",
-            "eight": "8",
-            "nine": "9",
-        }.get(digit_name, digit_name)
+        return DIGIT_NAMES.get(digit_name, digit_name)
 
     def get_digits(self, string: str) -> tuple[str, ...]:
-        pattern = (
-            re.compile(r"\d")
-            if self.puzzle_part == 1
-            else re.compile(
-                r"(?=(\d|one|two|three|four|five|six|seven|eight|nine))"
-            )
-        )
-        found_digits = re.findall(pattern, string)
-        return tuple(
-            self.name_to_digit(digit)
-            for digit in
-            (found_digits[0], found_digits[-1])
-        )
+        first_digit = FIRST_DIGIT_PATTERNS[self.puzzle_part].search(string).group()
+        last_digit = LAST_DIGIT_PATTERNS[self.puzzle_part].search(string[::-1]).group()[::-1]
+        return self.name_to_digit(first_digit), self.name_to_digit(last_digit)
 
     @staticmethod
     def combine_digits(digits: tuple[str, ...]) -> int:
         return int(''.join(digits))
 
     def solve(self):
-        stuff = self.get_input()
-        digits = [self.get_digits(line) for line in stuff]
-        ints = [self.combine_digits(digit_pair) for digit_pair in digits]
-        return sum(ints)
+        return sum(
+            self.combine_digits(self.get_digits(line))
+            for lines in self.stream_input(by_line=False)
+            for line in lines
+        )
@@ -1,26 +1,19 @@
-import itertools
+from array import array
 from enum import Enum
+from functools import cached_property
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib import animation
-from matplotlib.animation import FuncAnimation
+import numpy as np
 
+from grid import NEIGHBORS_4
 from solver import Solver
 
 
-Coordinate = tuple[int | float, int | float]
-
-
 class Direction(tuple, Enum):
     UP = (-1, 0)
     DOWN = (1, 0)
     LEFT = (0, -1)
     RIGHT = (0, 1)
 
-    def __neg__(self):
-        return tuple(-x for x in self)
-
 
 class PipeShapes(str, Enum):
     VERTICAL = "|"
@@ -42,148 +35,140 @@ PIPE_SHAPE_MAP = {
     PipeShapes.NO_PIPE: (),
 }
 
+# Moves are traced as indices into MOVES, in clockwise order so the opposite of move m is m ^ 2.
+MOVES = [Direction(offset) for offset in NEIGHBORS_4]
+
+
+def turn_table() -> list[list[int]]:
+    """turns[tile][move]: the move out of a tile entered with `move`, or -1 if its pipe doesn't connect."""
+    turns = [[-1] * len(MOVES) for _ in range(256)]
+    for shape, moves in PIPE_SHAPE_MAP.items():
+        for end, other_end in (moves, moves[::-1]) if moves else ():
+            # entering through an end means moving in the opposite direction
+            turns[ord(shape)][MOVES.index(end) ^ 2] = MOVES.index(other_end)
+    return turns
+
+
+TURNS = turn_table()
+
 
 class Puzzle10Solver(Solver):
     def __init__(self, part: int = 1):
         super().__init__(10, part)
-        self.map = self.get_input()
-        self.initial_position = self.get_initial_position()
-        self.loop = self.solve_loop()
-        self.height = len(self.map)
-        self.width = len(self.map[0])
-
-    def process_input(self, content: str):
-        return content.splitlines()
-
-    def get_initial_position(self):
-        for r, line in enumerate(self.map):
-            if (c := line.find("S")) >= 0:
-                return r, c
-
-    def in_bounds(self, r, c):
-        return -0.5 <= r < self.height and -0.5 <= c < self.width
-
-    def get_neighbors(self, position: Coordinate):
-        r, c = position
-        for rn, cn in [(r - 1, c), (r, c + 1), (r + 1, c), (r, c - 1)]:
-            if self.in_bounds(rn, cn) and self.is_connected(position, (rn, cn)):
-                yield rn, cn
-
-    def get_first_move(self) -> Direction:
-        r, c = self.initial_position
-        # above
-        if Direction.DOWN in PIPE_SHAPE_MAP[self.map[r - 1][c]]:
-            return Direction.UP
-        # right
-        if Direction.LEFT in PIPE_SHAPE_MAP[self.map[r][c + 1]]:
-            return Direction.RIGHT
-        # below
-        if Direction.UP in PIPE_SHAPE_MAP[self.map[r + 1][c]]:
-            return Direction.DOWN
-        # left
-        if Direction.RIGHT in PIPE_SHAPE_MAP[self.map[r][c - 1]]:
-            return Direction.LEFT
-
-    def get_next_move(self, position: Coordinate, move: Direction) -> Direction:
-        r, c = position
-        moves = PIPE_SHAPE_MAP[self.map[r][c]]
-        return moves[not moves.index(-move)]
-
-    @staticmethod
-    def get_next_position(position: Coordinate, move: Direction):
-        return position[0] + move[0], position[1] + move[1]
-
-    def solve_loop(self) -> dict[Coordinate, int]:
-        position = self.initial_position
-        move = self.get_first_move()
-        steps = 0
-        loop = {}
+        # the grid's newlines also stop the loop running off either side
+        self.grid = self.get_grid()
+        self.map = self.grid.cells
+        self.height, self.width = self.grid.shape
+        self.initial_position = self.grid.find("S")
+
+    @property
+    def stride(self) -> int:
+        return self.grid.stride
+
+    @cached_property
+    def offsets(self) -> list[int]:
+        """The change in flat index for each of MOVES."""
+        return self.grid.flat_offsets(MOVES)
+
+    def get_first_move(self) -> int:
+        cells = self.grid.buffer
+        start = self.grid.flat_index(*self.initial_position)
+        for move, offset in enumerate(self.offsets):
+            if 0 <= start + offset < len(cells) and TURNS[cells[start + offset]][move] >= 0:
+                return move
+        raise ValueError("no pipe connects to the start")
+
+    @cached_property
+    def trace(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.solve_loop()
+
+    @property
+    def loop(self) -> np.ndarray:
+        """The step on which the loop reaches each tile, or -1, as a flat array indexed like the grid."""
+        return self.trace[0]
+
+    @property
+    def loop_length(self) -> int:
+        return len(self.trace[1])
+
+    @property
+    def vertices(self) -> np.ndarray:
+        """Flat indices of the loop's corners, in the order it is traced."""
+        return self.trace[2]
+
+    def solve_loop(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        cells = memoryview(self.grid.buffer)
+        offsets = self.offsets
+        start = self.grid.flat_index(*self.initial_position)
+        first_move = move = self.get_first_move()
+        position = start
+        path = array("i")
+        vertices = array("i")
 
         while True:
-            position = self.get_next_position(position, move)
-            loop[position] = steps
-            steps += 1
-            if position == self.initial_position:
-                return loop
-            move = self.get_next_move(position, move)
-
-    def is_connected(self, node: Coordinate, neighbor: Coordinate) -> bool:
-        (r, c), (rn, cn) = node, neighbor
-
-        rs = (
-            [int((r + rn) // 2)] * 2
-            if r != rn
-            else [int(r - 0.5), int(r + 0.5)]
-        )
-        cs = (
-            [int((c + cn) // 2)] * 2
-            if c != cn
-            else [int(c - 0.5), int(c + 0.5)]
-        )
-
-        loop_node_1, loop_node_2 = zip(rs, cs)
-        blocked = (
-                loop_node_1 in self.loop
-                and loop_node_2 in self.loop
-                and self.loop[loop_node_1] - self.loop[loop_node_2] in (-1, 1, -len(self.loop) + 1, len(self.loop) - 1)
-        )
-        return not blocked
-
-    @staticmethod
-    def draw_grid(grid_width, grid_height, highlighted_squares, highlighted_corners):
-        fig, ax = plt.subplots()
-
-        # Draw grid squares
-        for r in range(grid_height):
-            for c in range(grid_width):
-                square = patches.Rectangle((c, grid_height - r - 1), 1, 1, edgecolor='gray', facecolor='none')
-                ax.add_patch(square)
-
-        # Highlight squares
-        for sq in highlighted_squares:
-            r, c = sq
-            highlight = patches.Rectangle((c + .1, grid_height - r - 1 + .1), .8, .8, edgecolor='red', facecolor='red', lw=2)
-            ax.add_patch(highlight)
-
-        # Mark corners
-        for corner in highlighted_corners:
-            r, c = corner
-            ax.plot(c + 0.5, grid_height - r - 1 + 0.5, 'bo', markersize=10)  # 'bo' is blue circle marker
-
-        plt.xlim(0, grid_width)
-        plt.ylim(0, grid_height)
-        plt.gca().set_aspect('equal', adjustable='box')
-        plt.show()
+            position += offsets[move]
+            if not 0 <= position < len(cells):
+                raise ValueError("the loop runs off the map")
+            path.append(position)
+            if position == start:
+                if move != first_move:
+                    vertices.append(position)
+                break
+            next_move = TURNS[cells[position]][move]
+            if next_move < 0:
+                raise ValueError(f"the loop breaks at {self.grid.position(position)}")
+            if next_move != move:
+                vertices.append(position)
+            move = next_move
+
+        path = np.frombuffer(path, dtype=np.int32)
+        loop = np.full(self.height * self.stride, -1, dtype=np.int32)
+        loop[path] = np.arange(len(path), dtype=np.int32)
+        return loop, path, np.frombuffer(vertices, dtype=np.int32)
+
+    def double_area(self) -> int:
+        """Twice the area the loop's path encloses, by the shoelace formula over its corners."""
+        r, c = np.divmod(self.vertices.astype(np.int64), self.stride)
+        return abs(int((r * np.roll(c, -1) - np.roll(r, -1) * c).sum()))
+
+    @property
+    def loop_grid(self) -> np.ndarray:
+        """self.loop as an (h, w) array."""
+        return self.loop.reshape(self.height, self.stride)[:, :-1]
+
+    def inside_mask(self) -> np.ndarray:
+        """
+        Tiles enclosed by the loop, by scanline parity: scanning a row, each loop tile with a
+        pipe going up crosses the loop.
+        """
+        crossings = self.grid.mask("".join(
+            shape for shape, moves in PIPE_SHAPE_MAP.items() if Direction.UP in moves
+        )) & (self.loop_grid >= 0)
+
+        # S goes up if the loop leaves or enters it through the tile above
+        above = self.grid.flat_index(*self.initial_position) - self.stride
+        if above >= 0 and self.loop[above] in (0, self.loop_length - 2):
+            crossings[self.initial_position] = True
+
+        return (np.cumsum(crossings, axis=1) % 2 == 1) & (self.loop_grid < 0)
+
+    def draw_grid(self):
+        # matplotlib is slow to import, so only load it when something is actually drawn
+        from visualization import draw_grid
+
+        on_loop = self.loop_grid >= 0
+        inside = self.inside_mask()
+        draw_grid(on_loop, inside, ~(on_loop | inside))
+
+    def save_animation(self, path: str, frame_count: int = 200, fps: int = 30, writer=None):
+        """Write a movie of the loop being traced and then filled in, streaming one frame at a time."""
+        from visualization import loop_frames, save_animation
+
+        save_animation(loop_frames(self.loop_grid, self.inside_mask(), frame_count), path, fps, writer=writer)
 
     def solve(self):
         if self.puzzle_part == 1:
-            return len(self.loop) // 2
-
-        out_of_loop = set()
-        fringe = [(-0.5, -0.5)]
-
-        while fringe:
-            node = fringe.pop(0)
-            out_of_loop.add(node)
-
-            for neighbor in self.get_neighbors(node):
-                if neighbor not in out_of_loop and neighbor not in fringe:
-                    fringe.append(neighbor)
-
-        # self.draw_grid(self.width, self.height, self.loop, out_of_loop)
-
-        in_loop = {
-            (r, c)
-            for r, c in itertools.product(range(self.height), range(self.width))
-            if any(
-                corner not in out_of_loop
-                for corner in [
-                    (r - 0.5, c - 0.5),
-                    (r - 0.5, c + 0.5),
-                    (r + 0.5, c - 0.5),
-                    (r + 0.5, c + 0.5),
-                ]
-            ) and (r, c) not in self.loop
-        }
-
-        return len(in_loop)
+            return self.loop_length // 2
+
+        # Pick's theorem: the area is the interior tiles plus half the boundary, less one
+        return (self.double_area() - self.loop_length) // 2 + 1
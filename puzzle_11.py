@@ -1,56 +1,244 @@
-import itertools
+from collections import Counter
+from collections.abc import Iterable
+from functools import cached_property
+from operator import mul
 
+import numpy as np
+
+from numeric_parsing import INT64_MAX
 from solver import Solver
 
 
+def pairwise_distance_sum(positions: np.ndarray) -> int:
+    """
+    Sum of |a - b| over every pair of positions on one axis.
+
+    Once sorted, the i-th of n positions is the larger of i pairs and the smaller of n - 1 - i.
+    """
+    positions = np.sort(positions).astype(np.int64)
+    weights = 2 * np.arange(len(positions), dtype=np.int64) - (len(positions) - 1)
+    if int(np.abs(positions).max(initial=0)) * len(positions) ** 2 <= INT64_MAX:
+        return int(positions @ weights)
+    return sum(map(mul, positions.tolist(), weights.tolist()))
+
+
+class FenwickTree:
+    """Prefix sums of a list of ints, with point updates, both in O(log n)."""
+
+    def __init__(self, values):
+        self.tree = [0, *values]
+        for i in range(1, len(self.tree)):
+            parent = i + (i & -i)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def add(self, index: int, delta: int):
+        if index < 0:
+            raise IndexError(f"index {index} out of range")
+        index += 1
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, stop: int) -> int:
+        """Sum of the values before `stop`."""
+        total = 0
+        while stop > 0:
+            total += self.tree[stop]
+            stop -= stop & -stop
+        return total
+
+
+class LineCrossings:
+    """
+    For galaxy counts at each position along one axis, the number of empty lines crossed
+    between every pair of galaxies, kept up to date as counts change.
+
+    An empty line between two galaxies is an ordered (galaxy, empty, galaxy) triple, which
+    prefix sums can't count, so this is a segment tree whose nodes count, over their span:
+    galaxies, empty lines, (galaxy, empty) and (empty, galaxy) pairs, and triples.
+    """
+
+    def __init__(self, counts: list[int]):
+        self.leaves = 1 << max(len(counts) - 1, 0).bit_length()
+        self.nodes = [(0, 0, 0, 0, 0)] * (2 * self.leaves)
+        for position, count in enumerate(counts):
+            self.nodes[self.leaves + position] = self.leaf(count)
+        for node in range(self.leaves - 1, 0, -1):
+            self.nodes[node] = self.combine(self.nodes[2 * node], self.nodes[2 * node + 1])
+
+    @staticmethod
+    def leaf(count: int) -> tuple[int, int, int, int, int]:
+        return count, int(count == 0), 0, 0, 0
+
+    @staticmethod
+    def combine(left, right) -> tuple[int, int, int, int, int]:
+        galaxies, empty, galaxy_empty, empty_galaxy, crossings = left
+        right_galaxies, right_empty, right_galaxy_empty, right_empty_galaxy, right_crossings = right
+        return (
+            galaxies + right_galaxies,
+            empty + right_empty,
+            galaxy_empty + right_galaxy_empty + galaxies * right_empty,
+            empty_galaxy + right_empty_galaxy + empty * right_galaxies,
+            crossings + right_crossings + galaxy_empty * right_galaxies + galaxies * right_empty_galaxy,
+        )
+
+    def set_count(self, position: int, count: int):
+        node = self.leaves + position
+        self.nodes[node] = self.leaf(count)
+        while node > 1:
+            node //= 2
+            self.nodes[node] = self.combine(self.nodes[2 * node], self.nodes[2 * node + 1])
+
+    @property
+    def total(self) -> int:
+        return self.nodes[1][4]
+
+
+class GalaxyAxis:
+    """Galaxy positions along one axis, with their pairwise distance terms kept up to date."""
+
+    def __init__(self, size: int, positions: np.ndarray):
+        self.counts = np.bincount(positions, minlength=size).tolist()
+        self.position_counts = FenwickTree(self.counts)
+        self.position_sums = FenwickTree([position * count for position, count in enumerate(self.counts)])
+        self.line_crossings = LineCrossings(self.counts)
+        self.base = pairwise_distance_sum(positions)
+
+    @property
+    def crossings(self) -> int:
+        return self.line_crossings.total
+
+    def distance_to(self, position: int) -> int:
+        """Sum of the distances from `position` to every galaxy, before expansion."""
+        below = self.position_counts.prefix_sum(position)
+        below_sum = self.position_sums.prefix_sum(position)
+        above = self.position_counts.prefix_sum(len(self.counts)) - below
+        above_sum = self.position_sums.prefix_sum(len(self.counts)) - below_sum
+        return position * below - below_sum + above_sum - position * above
+
+    def add(self, position: int, delta: int = 1):
+        if self.counts[position] + delta < 0:
+            raise ValueError(f"no galaxy at {position} to remove")
+        if delta > 0:
+            self.base += delta * self.distance_to(position)
+        self.counts[position] += delta
+        self.position_counts.add(position, delta)
+        self.position_sums.add(position, delta * position)
+        self.line_crossings.set_count(position, self.counts[position])
+        if delta < 0:
+            self.base += delta * self.distance_to(position)
+
+
+class GalaxyMap:
+    """
+    Galaxies that can be added and removed, keeping the total distance between them up to date
+    in O(log n) per change, for any expansion factor.
+
+    Lines are empty while they have no galaxies, so adding a galaxy to an empty row or column
+    fills it, and removing the last one empties it again.
+    """
+
+    def __init__(self, height: int, width: int, rows: np.ndarray, columns: np.ndarray):
+        self.height = height
+        self.width = width
+        self.rows = GalaxyAxis(height, rows)
+        self.columns = GalaxyAxis(width, columns)
+        # the axes only know each row's and column's count, not where galaxies actually are
+        self.galaxies = Counter(zip(rows.tolist(), columns.tolist()))
+
+    def check_on_map(self, row: int, column: int):
+        # checked before either axis changes, so a bad position can't leave them out of step
+        if not (0 <= row < self.height and 0 <= column < self.width):
+            raise ValueError(f"{(row, column)} is off the {self.height}x{self.width} map")
+
+    def add_galaxy(self, row: int, column: int):
+        self.check_on_map(row, column)
+        self.rows.add(row)
+        self.columns.add(column)
+        self.galaxies[row, column] += 1
+
+    def remove_galaxy(self, row: int, column: int):
+        self.check_on_map(row, column)
+        if not self.galaxies[row, column]:
+            raise ValueError(f"no galaxy at {(row, column)} to remove")
+        self.rows.add(row, -1)
+        self.columns.add(column, -1)
+        self.galaxies[row, column] -= 1
+
+    @property
+    def distance_terms(self) -> tuple[int, int]:
+        return self.rows.base + self.columns.base, self.rows.crossings + self.columns.crossings
+
+    def distance_sum(self, expansion_factor: int) -> int:
+        base, crossings = self.distance_terms
+        return base + (expansion_factor - 1) * crossings
+
+
 class Puzzle11Solver(Solver):
     def __init__(self, part: int = 1):
         super().__init__(11, part)
-        self.map = self.get_input()
-        self.height = len(self.map)
-        self.width = len(self.map[0])
-        self.galaxy_coordinates = self.get_galaxy_coordinates()
-        self.empty_rows, self.empty_columns = self.find_empty_row_and_columns()
-
-    def process_input(self, content: str):
-        return content.splitlines()
-
-    def find_empty_row_and_columns(self):
-        empty_row_indices = [
-            i
-            for i, row in enumerate(self.map)
-            if "#" not in row
-        ]
-        empty_column_indices = [
-            i
-            for i in range(self.width)
-            if all(row[i] == "." for row in self.map)
-        ]
-        return empty_row_indices, empty_column_indices
-
-    def get_galaxy_coordinates(self):
-        return [
-            (r, c)
-            for r, c in itertools.product(range(self.height), range(self.width))
-            if self.map[r][c] == "#"
-        ]
-
-    def get_distance(self, galaxy_1, galaxy_2):
-        (r1, c1), (r2, c2) = galaxy_1, galaxy_2
-        expansion_factor = (
-            2 if self.puzzle_part == 1 else 1_000_000
-        )
-        vertical_distance = abs(r2 - r1) + sum(
-            expansion_factor - 1 for empty_row in self.empty_rows if min(r1, r2) < empty_row < max(r1, r2)
+        self.grid = self.get_grid()
+        self.map = self.grid.cells
+        self.height, self.width = self.grid.shape
+
+    @cached_property
+    def galaxy_coordinates(self) -> tuple[np.ndarray, np.ndarray]:
+        """Rows and columns of every galaxy."""
+        return self.grid.find_all("#")
+
+    @cached_property
+    def empty_row_and_columns(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.grid.rows_without("#"), self.grid.columns_without("#")
+
+    @property
+    def empty_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.empty_row_and_columns[0])
+
+    @property
+    def empty_columns(self) -> np.ndarray:
+        return np.flatnonzero(self.empty_row_and_columns[1])
+
+    @cached_property
+    def empty_before(self) -> tuple[np.ndarray, np.ndarray]:
+        """How many empty rows, and empty columns, come before each galaxy."""
+        return tuple(
+            (np.cumsum(is_empty) - is_empty)[positions]
+            for positions, is_empty in zip(self.galaxy_coordinates, self.empty_row_and_columns)
         )
-        horizontal_distance = abs(c2 - c1) + sum(
-            expansion_factor - 1 for empty_column in self.empty_columns if min(c1, c2) < empty_column < max(c1, c2)
+
+    def expanded_coordinates(self, expansion_factor: int) -> tuple[np.ndarray, np.ndarray]:
+        """Galaxy rows and columns after every empty line before them grows `expansion_factor` times."""
+        rows, columns = self.galaxy_coordinates
+        empty_rows_before, empty_columns_before = self.empty_before
+        return (
+            rows + (expansion_factor - 1) * empty_rows_before,
+            columns + (expansion_factor - 1) * empty_columns_before,
         )
-        return vertical_distance + horizontal_distance
+
+    @cached_property
+    def distance_terms(self) -> tuple[int, int]:
+        """
+        The total distance between galaxies before expansion, and the total number of empty
+        lines crossed between them.
+
+        Each crossed line adds (expansion factor - 1) to a distance, so together these give the
+        total for any expansion factor.
+        """
+        base = sum(map(pairwise_distance_sum, self.galaxy_coordinates))
+        crossings = sum(map(pairwise_distance_sum, self.empty_before))
+        return base, crossings
+
+    def distance_sum(self, expansion_factor: int) -> int:
+        base, crossings = self.distance_terms
+        return base + (expansion_factor - 1) * crossings
+
+    def distance_sums(self, expansion_factors: Iterable[int]) -> list[int]:
+        return [self.distance_sum(expansion_factor) for expansion_factor in expansion_factors]
+
+    def galaxy_map(self) -> GalaxyMap:
+        """The galaxies, in a form that can be changed without recomputing every distance."""
+        return GalaxyMap(self.height, self.width, *self.galaxy_coordinates)
 
     def solve(self):
-        total = 0
-        for i, galaxy_1 in enumerate(self.galaxy_coordinates):
-            for j, galaxy_2 in enumerate(self.galaxy_coordinates[:i]):
-                total += self.get_distance(galaxy_1, galaxy_2)
-        return total
+        return self.distance_sum(2 if self.puzzle_part == 1 else 1_000_000)
@@ -1,7 +1,9 @@
 import enum
-import re
-from functools import reduce, cache
+from collections.abc import Iterator
 
+import numpy as np
+
+from numeric_parsing import as_bytes, parse_integers
 from solver import Solver
 
 
@@ -11,50 +13,74 @@ class CubeColor(str, enum.Enum):
     BLUE = "blue"
 
 
+COLORS = list(CubeColor)
+
+
+class Games:
+    """
+    Columnar store of games: their numbers, and the max count of each color seen in any turn.
+
+    `max_cubes[i, j]` is the fewest cubes of color `COLORS[j]` that game `i` could be played with.
+    """
+
+    def __init__(self, numbers: np.ndarray, max_cubes: np.ndarray):
+        self.numbers = numbers
+        self.max_cubes = max_cubes
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __getitem__(self, i: int) -> "Game":
+        return Game(int(self.numbers[i]), self.max_cubes[i])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @classmethod
+    def from_str(cls, content: str) -> "Games":
+        buffer = as_bytes(content)
+        values, _, ends = parse_integers(buffer)
+
+        # a game number is followed by ":", and a count by a space and its color's first letter
+        is_label = buffer[ends] == ord(":")
+        numbers = values[is_label]
+        game_index = np.cumsum(is_label)[~is_label] - 1
+        first_letters = buffer[ends[~is_label] + 1]
+        color_index = np.zeros(len(game_index), dtype=np.intp)
+        for j, color in enumerate(COLORS):
+            color_index[first_letters == ord(color.value[0])] = j
+
+        max_cubes = np.zeros((len(numbers), len(COLORS)), dtype=np.int64)
+        np.maximum.at(max_cubes, (game_index, color_index), values[~is_label])
+        return cls(numbers, max_cubes)
+
+    def possible(self, total_cubes: dict[str, int]) -> np.ndarray:
+        totals = np.array([total_cubes[color] for color in COLORS], dtype=np.int64)
+        return (self.max_cubes <= totals).all(axis=1)
+
+    def powers(self) -> np.ndarray:
+        return self.max_cubes.prod(axis=1)
+
+
 class Game:
-    def __init__(self, number: int, turns: dict[CubeColor: int]):
+    """A single game, viewing one row of a `Games` store."""
+
+    def __init__(self, number: int, max_cubes: np.ndarray):
         self.number = number
-        self.turns = turns
+        self.max_cubes = max_cubes
 
     def __str__(self):
-        return f"Game {self.number}: {self.turns}"
+        return f"Game {self.number}: {self.min_cubes()}"
 
     def __repr__(self):
         return str(self)
 
     @classmethod
     def from_str(cls, game_str: str):
-        label, _, play = game_str.partition(": ")
-        number = int(re.search(r"\d+", label).group())
-        turn_strs = play.split(";")
-
-        def turn_from_str(turn: str) -> dict[CubeColor, int]:
-            observations = turn.split(", ")
-            turn = {}
-            for observation in observations:
-                count, color = observation.split()
-                turn[color] = int(count)
-            return turn
-
-        turns = [
-            turn_from_str(turn)
-            for turn
-            in turn_strs
-        ]
-        return cls(number, turns)
-
-    @cache
+        return Games.from_str(game_str)[0]
+
     def min_cubes(self) -> dict[str, int]:
-        def pick_maxes(turn_1, turn_2) -> dict[str, int]:
-            return {
-                color: max(
-                    turn_1.get(color, 0),
-                    turn_2.get(color, 0),
-                )
-                for color
-                in CubeColor
-            }
-        return reduce(pick_maxes, self.turns)
+        return {color: int(count) for color, count in zip(COLORS, self.max_cubes)}
 
     def is_possible(self, total_cubes: dict[str, int]) -> bool:
         return all(
@@ -71,24 +97,12 @@ class Puzzle2Solver(Solver):
             CubeColor.BLUE: 14,
         }
 
-    def process_input(self, content: str):
-        lines = content.splitlines()
-        return [
-            Game.from_str(game_str)
-            for game_str in
-            lines
-        ]
+    def process_input(self, chunks: Iterator[str]) -> Iterator[Games]:
+        return (Games.from_str(chunk) for chunk in chunks)
 
     def solve(self):
-        games = self.get_input()
+        batches = self.stream_input(by_line=False)
         if self.puzzle_part == 1:
-            return sum(
-                game.number
-                for game in games
-                if game.is_possible(self.total_cubes)
-            )
+            return sum(int(games.numbers[games.possible(self.total_cubes)].sum()) for games in batches)
         else:
-            return sum(
-                reduce(int.__mul__, game.min_cubes().values())
-                for game in games
-            )
+            return sum(int(games.powers().sum()) for games in batches)
@@ -1,50 +1,89 @@
-import itertools
-import re
-from collections import defaultdict
-from collections.abc import Generator
-from functools import reduce
+from collections.abc import Iterator
+from functools import cached_property
 
+import numpy as np
+
+from grid import NEIGHBORS_8
+from numeric_parsing import parse_integers
 from solver import Solver
 
 
 class Puzzle3Solver(Solver):
     def __init__(self, part: int = 1):
         super().__init__(3, part)
-        self.schematic = self.get_input()
-        self.gears = defaultdict(lambda: [])
-
-    def process_input(self, content: str):
-        return content.splitlines()
-
-    def iter_schematic(self) -> Generator[bool, int]:
-        for i, row in enumerate(self.schematic):
-            for number in re.finditer(r"\d+", row):
-                squares_to_check = list(filter(
-                    lambda ix: 0 <= ix[0] < len(row) and 0 <= ix[1] < len(self.schematic),
-                    itertools.product(
-                        range(i - 1, i + 2),
-                        range(number.span()[0] - 1, number.span()[1] + 1)
-                    ),
-                ))
-                part = re.search(
-                    r"[^\d\.]",
-                    "".join(self.schematic[x][y] for x, y in squares_to_check),
-                )
-                if part and part.group() == "*":
-                    gear_loc = squares_to_check[part.span()[0]]
-                    self.gears[gear_loc].append(int(number.group()))
-                yield part, int(number.group())
+        self.grid = self.get_grid()
+        self.schematic = self.grid.cells
+        self.height, self.width = self.grid.shape
+
+    @cached_property
+    def numbers(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Value, row, first column and end column of every number."""
+        # rows are separated by newlines, so numbers never run from one row into the next
+        values, starts, ends = parse_integers(self.grid.buffer)
+        rows, columns = np.divmod(starts, self.grid.stride)
+        return values, rows, columns, columns + (ends - starts)
+
+    @cached_property
+    def symbol_mask(self) -> np.ndarray:
+        """Cells next to a symbol."""
+        return self.grid.dilate(~self.grid.mask("0123456789."))
+
+    @cached_property
+    def is_part(self) -> np.ndarray:
+        """Whether each number touches a symbol, from row-wise prefix counts of the symbol mask."""
+        _, rows, starts, ends = self.numbers
+        counts = np.zeros((self.height, self.width + 1), dtype=np.int32)
+        np.cumsum(self.symbol_mask, axis=1, out=counts[:, 1:])
+        return counts[rows, ends] > counts[rows, starts]
+
+    @cached_property
+    def number_labels(self) -> np.ndarray:
+        """Index of the number covering each cell, or -1, with a border of -1 around the grid."""
+        _, rows, starts, ends = self.numbers
+        lengths = ends - starts
+        number_index = np.repeat(np.arange(len(lengths)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        labels = np.full((self.height + 2, self.width + 2), -1, dtype=np.int32)
+        labels[np.repeat(rows, lengths) + 1, np.repeat(starts, lengths) + offsets + 1] = number_index
+        return labels
+
+    @cached_property
+    def gears(self) -> dict[tuple[int, int], list[int]]:
+        """The numbers adjacent to each "*", by its position."""
+        values = self.numbers[0]
+        positions, neighbors = self.gear_neighbors()
+        return {
+            (int(r), int(c)): [int(values[label]) for label in labels[labels >= 0]]
+            for (r, c), labels in zip(positions, neighbors)
+        }
+
+    def gear_neighbors(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Positions of every "*", and the distinct numbers around each.
+
+        Neighbors come as a sorted (n_stars, 8) label array, with -1 in place of repeats.
+        """
+        positions = np.argwhere(self.schematic == ord("*"))
+        rows, columns = positions.T + 1
+        neighbors = np.sort(np.stack(
+            [self.number_labels[rows + dr, columns + dc] for dr, dc in NEIGHBORS_8],
+            axis=1,
+        ), axis=1)
+        neighbors[:, 1:][neighbors[:, 1:] == neighbors[:, :-1]] = -1
+        return positions, np.sort(neighbors, axis=1)
+
+    def gear_ratios(self) -> np.ndarray:
+        values = self.numbers[0]
+        _, neighbors = self.gear_neighbors()
+        is_gear = (neighbors >= 0).sum(axis=1) == 2
+        # after sorting, a gear's two numbers are its last two labels
+        return values[neighbors[is_gear, -1]] * values[neighbors[is_gear, -2]]
+
+    def iter_schematic(self) -> Iterator[tuple[bool, int]]:
+        return zip(self.is_part.tolist(), self.numbers[0].tolist())
 
     def solve(self):
-        sum_part_numbers = sum(
-            number
-            for is_part, number in self.iter_schematic()
-            if is_part
-        )
         if self.puzzle_part == 1:
-            return sum_part_numbers
-        return sum(
-            reduce(int.__mul__, numbers)
-            for numbers in self.gears.values()
-            if len(numbers) == 2
-        )
+            return int(self.numbers[0][self.is_part].sum())
+        return int(self.gear_ratios().sum())
@@ -1,38 +1,135 @@
-import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import chain
 
+import numpy as np
+
+from numeric_parsing import as_bytes, parse_integers
 from solver import Solver
 
 
+# Numbers below this are matched with per-card bitsets, larger ones by sorting (card, number) keys.
+BITSET_LIMIT = 1024
+
+
 class Puzzle4Solver(Solver):
     def __init__(self, part: int = 1):
         super().__init__(4, part)
-        self.winning, self.mine = self.get_input()
-
-    def process_input(self, content: str):
-        lines = content.splitlines()
-        card_numbers, winning, mine = zip(*[
-            re.search(r"Card +(\d+): ([\d ]+) \| ([\d ]+)", line).groups() for line in lines
-        ])
-        return [
-            [
-                {int(number) for number in number_string.split()}
-                for number_string in numbers_list
-            ] for numbers_list in (winning, mine)
-        ]
+
+    def process_input(self, chunks: Iterator[str]) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Winning numbers and numbers held for each card, a chunk of cards at a time."""
+        first_ends = winning_per_card = None
+        for chunk in chunks:
+            if first_ends is None:
+                first_line = chunk.partition("\n")[0]
+                _, first_starts, first_ends = parse_integers(as_bytes(first_line))
+                # the first number on each line is the card's own, which isn't needed
+                winning_per_card = int(np.searchsorted(first_starts, first_line.find("|"))) - 1
+
+            cards = self.read_columns(chunk, first_ends[1:])
+            if cards is None:
+                cards = parse_integers(as_bytes(chunk))[0].reshape(-1, len(first_ends))[:, 1:]
+            yield cards[:, :winning_per_card], cards[:, winning_per_card:]
+
+    @staticmethod
+    def read_columns(content: str, field_ends: np.ndarray) -> np.ndarray | None:
+        """
+        Read right-aligned numbers straight out of byte columns, if every line has the first's layout.
+
+        A field is read from the run of digits and spaces that ends at its end in the first line and
+        starts after the previous field. Returns None unless, on every line, each field holds one
+        right-aligned number kept apart from its neighbors.
+        """
+        line_length = len(content.partition("\n")[0])
+        buffer = as_bytes(content + "\n")
+        if len(buffer) % (line_length + 1):
+            return None
+        lines = buffer.reshape(-1, line_length + 1)
+        if (lines[:, -1] != ord("\n")).any():
+            return None
+
+        ones = lines[:, field_ends - 1] - ord("0")
+        if (ones > 9).any():
+            return None
+
+        widths = []
+        previous_end = 0
+        for end in field_ends.tolist():
+            width = 1
+            while end - width > previous_end and lines[0, end - width - 1] in b"0123456789 ":
+                width += 1
+            widths.append(width)
+            previous_end = end
+        widths = np.array(widths)
+
+        cards = ones.astype(np.int64)
+        # whether each field has reached its leading spaces on each line
+        padded = np.zeros(cards.shape, dtype=bool)
+        for place in range(1, int(widths.max())):
+            fields = np.flatnonzero(widths > place)
+            digits = lines[:, field_ends[fields] - 1 - place]
+            is_space = digits == ord(" ")
+            is_digit = (digits >= ord("0")) & (digits <= ord("9"))
+            # numbers are right-aligned, so no digit can come before a field's leading spaces
+            if not (is_space | (is_digit & ~padded[:, fields])).all():
+                return None
+            padded[:, fields] |= is_space
+            cards[:, fields] += np.where(is_space, 0, digits - ord("0")).astype(np.int64) * 10 ** place
+
+        # a number must not run on into the field before it, or out past the start of its own
+        field_starts = field_ends - widths
+        runs_on = field_starts == np.concatenate([[0], field_ends[:-1]])
+        if not padded[:, runs_on & (field_starts > 0)].all():
+            return None
+        before = lines[:, field_starts[~runs_on] - 1]
+        if ((before >= ord("0")) & (before <= ord("9"))).any():
+            return None
+        return cards
+
+    @staticmethod
+    def count_matches(winning: np.ndarray, mine: np.ndarray) -> np.ndarray:
+        max_number = int(max(winning.max(initial=0), mine.max(initial=0)))
+
+        if max_number < BITSET_LIMIT:
+            bits = np.left_shift(np.uint64(1), (winning % 64).astype(np.uint64))
+            mine_bits = (mine % 64).astype(np.uint64)
+            hits = np.zeros(len(winning), dtype=np.int64)
+            for word in range(max_number // 64 + 1):
+                bitset = np.bitwise_or.reduce(
+                    np.where(winning // 64 == word, bits, np.uint64(0)), axis=1, keepdims=True
+                )
+                in_word = mine // 64 == word
+                hits += (in_word & ((bitset >> mine_bits) & np.uint64(1)).astype(bool)).sum(axis=1)
+            return hits
+
+        rows = np.arange(len(winning), dtype=np.int64)[:, None] * (max_number + 1)
+        return np.isin(rows + mine, rows + winning).sum(axis=1)
+
+    @staticmethod
+    def compute_points(matches: np.ndarray) -> int:
+        return int(np.where(matches > 0, 1 << np.maximum(matches - 1, 0), 0).sum())
 
     @staticmethod
-    def compute_points(winning: set[int], mine: set[int]) -> int:
-        return 2 ** (len(intersection) - 1) if (intersection := winning & mine) else 0
+    def count_scratchcards(matches: Iterable[int]) -> int:
+        # difference array: card i's copies are added to the running count for cards
+        # i + 1 ... i + matches[i], then taken back off after that range. Only the changes
+        # for the cards a match count can reach are kept, so matches can be streamed.
+        pending = deque()
+        running = 0
+        total = 0
+        for match_count in matches:
+            running += pending.popleft() if pending else 0
+            copies = running + 1
+            total += copies
+            if match_count:
+                # pending[k] is now the change for the card k + 1 after this one
+                pending.extend([0] * (match_count + 1 - len(pending)))
+                running += copies
+                pending[match_count] -= copies
+        return total
 
     def solve(self):
+        matches = (self.count_matches(winning, mine) for winning, mine in self.stream_input(by_line=False))
         if self.puzzle_part == 1:
-            return sum(
-                self.compute_points(winning, mine)
-                for winning, mine
-                in zip(self.winning, self.mine)
-            )
-        num_scratchcards = {i: 1 for i, _ in enumerate(self.mine)}
-        for i, (winning, mine) in enumerate(zip(self.winning, self.mine)):
-            for j, _ in enumerate(winning & mine, start=1):
-                num_scratchcards[i + j] += num_scratchcards[i]
-        return sum(num_scratchcards.values())
+            return sum(self.compute_points(batch) for batch in matches)
+        return self.count_scratchcards(chain.from_iterable(batch.tolist() for batch in matches))
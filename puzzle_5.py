@@ -1,6 +1,10 @@
 import re
-from functools import reduce
+from bisect import bisect_right
+from functools import cached_property, reduce
 
+import numpy as np
+
+from numeric_parsing import as_bytes, parse_integers
 from solver import Solver
 
 
@@ -13,16 +17,88 @@ class Transform:
     def __str__(self):
         return f"[{self.source_range.start}, {self.source_range.stop}){self.offset:+}"
 
-    def __call__(self, source_num: int | range):
-        if isinstance(source_num, range):
-            # -1 + 1 to ensure that the end gets transformed if it == transform range end
-            return range(self(source_num.start), self(source_num.stop - 1) + 1)
-        return source_num + (
-            self.offset
-            if source_num in self.source_range
-            else 0
+
+class PiecewiseMap:
+    """
+    A map of the non-negative integers that adds `offsets[i]` to every x in [starts[i], starts[i + 1]).
+
+    `starts` is sorted and begins at 0, and the last piece is unbounded.
+    """
+
+    def __init__(self, starts: list[int], offsets: list[int]):
+        self.starts = starts
+        self.offsets = offsets
+
+    def __str__(self):
+        return " ".join(
+            f"[{start}, {stop}){offset:+}"
+            for start, stop, offset in zip(self.starts, [*self.starts[1:], "inf"], self.offsets)
         )
 
+    @classmethod
+    def from_transforms(cls, transforms: list[Transform]) -> "PiecewiseMap":
+        """The map that applies each transform in its range, and leaves everything else as is."""
+        starts, offsets = [0], [0]
+        for transform in sorted(transforms, key=lambda t: t.source_range.start):
+            if transform.source_range.start == starts[-1]:
+                offsets[-1] = transform.offset
+            else:
+                starts.append(transform.source_range.start)
+                offsets.append(transform.offset)
+            starts.append(transform.source_range.stop)
+            offsets.append(0)
+        return cls(starts, offsets).simplified()
+
+    def simplified(self) -> "PiecewiseMap":
+        """The same map, with neighboring pieces of equal offset merged."""
+        starts, offsets = [], []
+        for start, offset in zip(self.starts, self.offsets):
+            if not offsets or offset != offsets[-1]:
+                starts.append(start)
+                offsets.append(offset)
+        return PiecewiseMap(starts, offsets)
+
+    def __call__(self, x: int) -> int:
+        return x + self.offsets[bisect_right(self.starts, x) - 1]
+
+    @cached_property
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        return np.array(self.starts, dtype=np.int64), np.array(self.offsets, dtype=np.int64)
+
+    def map_points(self, points: np.ndarray) -> np.ndarray:
+        """Map an int64 array of points in one vectorized lookup."""
+        starts, offsets = self.arrays
+        return points + offsets[np.searchsorted(starts, points, side="right") - 1]
+
+    def iter_pieces(self, start: int, stop: int | None):
+        """Split [start, stop) at this map's breakpoints, yielding (start, stop, offset) pieces."""
+        i = bisect_right(self.starts, start) - 1
+        while stop is None or start < stop:
+            piece_stop = self.starts[i + 1] if i + 1 < len(self.starts) else None
+            if piece_stop is None or (stop is not None and stop <= piece_stop):
+                yield start, stop, self.offsets[i]
+                return
+            yield start, piece_stop, self.offsets[i]
+            start = piece_stop
+            i += 1
+
+    def then(self, other: "PiecewiseMap") -> "PiecewiseMap":
+        """The map applying this one and then `other`."""
+        starts, offsets = [], []
+        for start, stop, offset in zip(self.starts, [*self.starts[1:], None], self.offsets):
+            image_stop = None if stop is None else stop + offset
+            for image_start, _, other_offset in other.iter_pieces(start + offset, image_stop):
+                starts.append(image_start - offset)
+                offsets.append(offset + other_offset)
+        return PiecewiseMap(starts, offsets).simplified()
+
+    def map_ranges(self, ranges: list[range]) -> list[range]:
+        return [
+            range(start + offset, stop + offset)
+            for seed_range in ranges
+            for start, stop, offset in self.iter_pieces(seed_range.start, seed_range.stop)
+        ]
+
 
 class Puzzle5Solver(Solver):
     def __init__(self, part: int = 1):
@@ -31,10 +107,7 @@ class Puzzle5Solver(Solver):
 
     def process_seeds(self, seed_str):
         if self.puzzle_part == 1:
-            return [
-                range(int(start), int(start) + 1)
-                for start in re.findall(r"\d+", seed_str)
-            ]
+            return parse_integers(as_bytes(seed_str))[0]
         else:
             return [
                 range(int(start), int(start) + int(range_len))
@@ -44,16 +117,11 @@ class Puzzle5Solver(Solver):
     @staticmethod
     def process_maps(maps_str):
         return [
-            sorted(
-                [Transform(*row) for row in transformation],
-                key=lambda t: t.source_range.start,
-            )
-            for transformation in [
-                [
-                    [int(x) for x in row.split()]
-                    for row in mapping.splitlines()
-                ] for mapping in re.findall(r"map:\n([\d \n]+)\n\n", maps_str)
-            ]
+            PiecewiseMap.from_transforms([
+                Transform(*[int(x) for x in row.split()])
+                for row in mapping.strip().splitlines()
+            ])
+            for mapping in re.findall(r"map:\n([\d \n]+)", maps_str)
         ]
 
     def process_input(self, content: str):
@@ -62,35 +130,14 @@ class Puzzle5Solver(Solver):
         maps = self.process_maps(maps_str)
         return seeds, maps
 
-    @staticmethod
-    def update(seeds: list[range], transforms: list[Transform]):
-        # transforms are sorted
-        new_seeds = []
-        while seeds:
-            seed = seeds.pop(0)
-            new_seed_start = seed.start
-            for transform in transforms:
-                if new_seed_start in transform.source_range:
-                    # create new range for overlap of seed range and transform range
-                    if seed.stop in transform.source_range:
-                        new_seed_end = seed.stop
-                    else:
-                        new_seed_end = transform.source_range.stop
-                        # capture remaining seed range to be handled by other transforms
-                        if remaining_seed := range(transform.source_range.stop, seed.stop):
-                            seeds.insert(0, remaining_seed)
-                    new_seeds.append(transform(range(new_seed_start, new_seed_end)))
-                    break
-            else:
-                # gets mapped as is
-                new_seeds.append(seed)
-        return new_seeds
+    @cached_property
+    def location_map(self) -> PiecewiseMap:
+        """Every map composed into one, from seed straight to location."""
+        return reduce(PiecewiseMap.then, self.maps)
 
     def solve(self):
+        if self.puzzle_part == 1:
+            return int(self.location_map.map_points(self.seeds).min())
         return min(
-            loc_range.start for loc_range in reduce(
-                self.update,
-                self.maps,
-                self.seeds,
-            )
+            loc_range.start for loc_range in self.location_map.map_ranges(self.seeds)
         )
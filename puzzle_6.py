@@ -1,10 +1,34 @@
 import math
 import re
-from functools import reduce
 
+import numpy as np
+
+from numeric_parsing import MAX_INT64_DIGITS, as_bytes, parse_integers
 from solver import Solver
 
 
+# Races whose times are all below this are solved as a vectorized int64 batch; T ** 2 has to fit.
+BATCH_LIMIT = 1 << 31
+# Longest digit string converted by a single int() call, below Python's default 4300-digit limit.
+MAX_STR_DIGITS = 4000
+
+
+def int_from_digits(digits: str) -> int:
+    """int(digits), split in halves so arbitrarily long strings get past the int() length limit."""
+    if len(digits) <= MAX_STR_DIGITS:
+        return int(digits)
+    middle = len(digits) // 2
+    return int_from_digits(digits[:middle]) * 10 ** (len(digits) - middle) + int_from_digits(digits[middle:])
+
+
+def product(values: list[int]) -> int:
+    """Product of many ints, multiplied pairwise so the big intermediate products stay balanced."""
+    values = values or [1]
+    while len(values) > 1:
+        values = [math.prod(values[i:i + 2]) for i in range(0, len(values), 2)]
+    return values[0]
+
+
 class Race:
 
     def __init__(self, time: int, record: int):
@@ -21,39 +45,68 @@ class Race:
 class Puzzle6Solver(Solver):
     def __init__(self, part: int = 1):
         super().__init__(6, part)
-        self.races = self.get_input()
+        self.times, self.records = self.get_input()
+
+    @property
+    def races(self) -> list[Race]:
+        return [Race(int(time), int(record)) for time, record in zip(self.times, self.records)]
 
     def process_input(self, content: str):
         if self.puzzle_part == 1:
+            parsed = [parse_integers(as_bytes(line)) for line in content.splitlines()]
+            if all((ends - starts <= MAX_INT64_DIGITS).all() for _, starts, ends in parsed):
+                times, distances = (values for values, _, _ in parsed)
+                return times, distances
             times, distances = (
                 list(map(int, re.findall(r"\d+", line)))
                 for line in content.splitlines()
             )
-            return [Race(time, distance) for time, distance in zip(times, distances)]
+            return times, distances
         elif self.puzzle_part == 2:
             time, distance = (
-                int(''.join(re.findall(r"\d+", line)))
+                int_from_digits(''.join(re.findall(r"\d+", line)))
                 for line in content.splitlines()
             )
-            return [Race(time, distance)]
+            return [time], [distance]
 
     @staticmethod
     def solve_range(total_time, record):
-        # time_held ** 2 - total_time * time_held + record
-        a, b, c = 1, -total_time, record
+        """Exact range of hold times that beat the record, for integers of any size."""
+        # time_held ** 2 - total_time * time_held + record < 0
+        discriminant = total_time ** 2 - 4 * record
+        if discriminant <= 0:
+            return range(0)
+
+        # with the root floored, this is at most one below the first winning hold time
+        lower_bound = (total_time - math.isqrt(discriminant)) // 2
+        while 2 * lower_bound <= total_time and lower_bound * (total_time - lower_bound) <= record:
+            lower_bound += 1
+        # the winning hold times are symmetric about total_time / 2
+        return range(lower_bound, max(lower_bound, total_time - lower_bound + 1))
 
-        soln_0 = (-b - math.sqrt(b ** 2 - 4 * a * c)) / (2 * a)
-        soln_1 = (-b + math.sqrt(b ** 2 - 4 * a * c)) / (2 * a)
+    @classmethod
+    def count_ways(cls, total_time, record) -> int:
+        # len() of a range is limited to a C ssize_t, which part 2 can overflow
+        winning_range = cls.solve_range(total_time, record)
+        return winning_range.stop - winning_range.start
+
+    @staticmethod
+    def count_ways_batch(times: np.ndarray, records: np.ndarray) -> np.ndarray:
+        """Number of winning hold times for each race, for int64 times below BATCH_LIMIT."""
+        discriminant = times * times - 4 * records
+        root = np.sqrt(np.maximum(discriminant, 0).astype(np.float64)).astype(np.int64)
+        # correct float rounding so root == isqrt(discriminant)
+        root -= root * root > discriminant
+        root += (root + 1) * (root + 1) <= discriminant
 
-        lower_bound = int(soln_0 + 1)
-        upper_bound = math.ceil(soln_1)
-        return range(lower_bound, upper_bound)
+        lower_bound = (times - root) // 2
+        lower_bound += lower_bound * (times - lower_bound) <= records
+        return np.where(discriminant > 0, np.maximum(times - 2 * lower_bound + 1, 0), 0)
 
     def solve(self):
-        return reduce(
-            int.__mul__,
-            (
-                len(self.solve_range(race.time, race.record))
-                for race in self.races
-            ),
-        )
+        if isinstance(self.times, np.ndarray) and (self.times < BATCH_LIMIT).all():
+            return product(self.count_ways_batch(self.times, self.records).tolist())
+        return product([
+            self.count_ways(int(time), int(record))
+            for time, record in zip(self.times, self.records)
+        ])
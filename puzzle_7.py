@@ -1,6 +1,9 @@
-from collections import Counter
+from collections.abc import Iterator
 from enum import Enum
 
+import numpy as np
+
+from numeric_parsing import as_bytes, parse_integers
 from solver import Solver
 
 
@@ -14,112 +17,108 @@ class HandTypes(int, Enum):
     HIGH_CARD = 0
 
 
-class Card:
+CARD_ORDER = "23456789TJQKA"
+JOKER_CARD_ORDER = "J23456789TQKA"
+HAND_SIZE = 5
 
-    def __init__(self, value: str, uses_jokers: bool = False):
-        self.order = (
-            "J23456789TQKA"
-            if uses_jokers
-            else "23456789TJQKA"
-        )
-        self.value = value
 
-    def __lt__(self, other):
-        return self.order.find(self.value) < self.order.find(other.value)
+def rank_table(order: str) -> np.ndarray:
+    """Lookup from a card's ASCII byte to its rank in `order`."""
+    table = np.zeros(256, dtype=np.uint8)
+    table[[ord(card) for card in order]] = np.arange(len(order))
+    return table
+
+
+RANK_TABLES = {False: rank_table(CARD_ORDER), True: rank_table(JOKER_CARD_ORDER)}
+
+# hand type by the sizes of its largest and second largest groups of equal cards
+TYPE_TABLE = np.zeros((HAND_SIZE + 1, HAND_SIZE + 1), dtype=np.int64)
+TYPE_TABLE[5, :] = HandTypes.FIVE_OF_A_KIND
+TYPE_TABLE[4, :] = HandTypes.FOUR_OF_A_KIND
+TYPE_TABLE[3, 2] = HandTypes.FULL_HOUSE
+TYPE_TABLE[3, :2] = HandTypes.THREE_OF_A_KIND
+TYPE_TABLE[2, 2] = HandTypes.TWO_PAIR
+TYPE_TABLE[2, :2] = HandTypes.PAIR
+
+# a key is the hand type followed by each card's rank, as digits in base 13
+PLACE_VALUES = len(CARD_ORDER) ** np.arange(HAND_SIZE, -1, -1, dtype=np.int64)
 
-    def __str__(self):
-        return str(self.value)
 
-    def __eq__(self, other):
-        return str(self) == str(other)
+def encode_hands(ranks: np.ndarray, uses_jokers: bool = False) -> np.ndarray:
+    """Integer sort keys for an (n, 5) array of card ranks, ordering hands by strength."""
+    counts = np.zeros((len(ranks), len(CARD_ORDER)), dtype=np.uint8)
+    rows = np.arange(len(ranks))
+    for i in range(HAND_SIZE):
+        counts[rows, ranks[:, i]] += 1
 
-    def __hash__(self):
-        return hash(self.value)
+    jokers = np.zeros(len(ranks), dtype=np.uint8)
+    if uses_jokers:
+        # jokers rank lowest, and always join the largest group of other cards
+        jokers = counts[:, 0].copy()
+        counts[:, 0] = 0
+    counts.sort(axis=1)
+    hand_types = TYPE_TABLE[counts[:, -1] + jokers, counts[:, -2]]
+
+    return hand_types * PLACE_VALUES[0] + ranks.astype(np.int64) @ PLACE_VALUES[1:]
 
 
 class Hand:
+    __slots__ = ("cards", "uses_jokers", "key")
 
     def __init__(self, cards: str, uses_jokers: bool = False):
         self.uses_jokers = uses_jokers
-        self.cards = tuple(Card(card, uses_jokers=uses_jokers) for card in cards)
-        self.card_counter = Counter(self.cards)
+        self.cards = cards
+        ranks = RANK_TABLES[uses_jokers][as_bytes(cards)][None, :]
+        self.key = int(encode_hands(ranks, uses_jokers)[0])
 
     def __str__(self):
-        return "".join(str(card) for card in self.cards)
+        return self.cards
 
     def __repr__(self):
         return f'Hand("{str(self)}")'
 
-    def groups(self):
-        """Yield groups by strength"""
-        cards_and_counts = [(count, card) for card, count in self.card_counter.items()]
-        for count, card in sorted(cards_and_counts, reverse=True):
-            yield count, card
-
     def categorization(self):
         """Get hand name"""
-        joker_bonus = 0
-
-        if self.uses_jokers:
-            joker_bonus = self.card_counter.get("J", 0)
-
-            if joker_bonus == 5:
-                return HandTypes.FIVE_OF_A_KIND
-
-        groups = self.groups()
-        first_count, first_card = next(groups)
-        if first_card == "J":
-            first_count, first_card = next(groups)
-
-        first_count += joker_bonus
-
-        if first_count == 5:
-            return HandTypes.FIVE_OF_A_KIND
-        elif first_count == 4:
-            return HandTypes.FOUR_OF_A_KIND
-
-        second_count, second_card = next(groups)
-        if second_card == "J":
-            second_count, second_card = next(groups)
-
-        if first_count == 3:
-            if second_count == 2:
-                return HandTypes.FULL_HOUSE
-            else:
-                return HandTypes.THREE_OF_A_KIND
-        elif first_count == 2:
-            if second_count == 2:
-                return HandTypes.TWO_PAIR
-            else:
-                return HandTypes.PAIR
-        else:
-            return HandTypes.HIGH_CARD
+        return HandTypes(self.key // int(PLACE_VALUES[0]))
 
     def __lt__(self, other):
-        self_categorization = self.categorization()
-        other_categorization = other.categorization()
-
-        if self_categorization == other_categorization:
-            return self.cards < other.cards
-        return self_categorization < other_categorization
+        return self.key < other.key
 
 
 class Puzzle7Solver(Solver):
     def __init__(self, part: int = 1):
         super().__init__(7, part)
-        self.hands = self.get_input()
+        self.keys, self.bids = self.stream_input(by_line=False)
+
+    def process_input(self, chunks: Iterator[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sort keys and bids of every hand. Sorting needs them all at once, but as two int64s a
+        hand they take less memory than the text they are read from, a chunk at a time.
+        """
+        keys, bids = [], []
+        for chunk in chunks:
+            chunk_keys, chunk_bids = self.encode_chunk(chunk)
+            keys.append(chunk_keys)
+            bids.append(chunk_bids)
+        return (
+            np.concatenate(keys or [[]]).astype(np.int64, copy=False),
+            np.concatenate(bids or [[]]).astype(np.int64, copy=False),
+        )
 
-    def process_input(self, content: str):
-        return {
-            Hand(hand, uses_jokers=(self.puzzle_part == 2)): int(bid)
-            for hand, bid in [
-                line.split() for line in content.splitlines()
-            ]
-        }
+    def encode_chunk(self, chunk: str) -> tuple[np.ndarray, np.ndarray]:
+        buffer = as_bytes(chunk)
+        line_starts = np.concatenate([[0], np.flatnonzero(buffer == ord("\n")) + 1])
+        card_positions = line_starts[:, None] + np.arange(HAND_SIZE)
+
+        uses_jokers = self.puzzle_part == 2
+        keys = encode_hands(RANK_TABLES[uses_jokers][buffer[card_positions]], uses_jokers)
+
+        # blank out the cards, which can contain digits, before reading the bids
+        bid_buffer = buffer.copy()
+        bid_buffer[card_positions] = ord(" ")
+        bids = parse_integers(bid_buffer)[0]
+        return keys, bids
 
     def solve(self):
-        return sum(
-            i * bid
-            for i, (hand, bid)
-            in enumerate(sorted(self.hands.items()), start=1)
-        )
+        order = np.argsort(self.keys, kind="stable")
+        return int((self.bids[order] * np.arange(1, len(order) + 1)).sum())
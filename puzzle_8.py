@@ -1,7 +1,9 @@
+import math
 import re
 from enum import Enum
-from functools import reduce
-from itertools import cycle
+from functools import cached_property, reduce
+
+import numpy as np
 
 from solver import Solver
 
@@ -11,76 +13,218 @@ class Direction(int, Enum):
     RIGHT = 1
 
 
+def crt(residue: int, modulus: int, other_residue: int, other_modulus: int) -> int | None:
+    """The x mod lcm(modulus, other_modulus) congruent to both residues, or None if there isn't one."""
+    divisor = math.gcd(modulus, other_modulus)
+    if (other_residue - residue) % divisor:
+        return None
+    reduced_modulus = other_modulus // divisor
+    k = (other_residue - residue) // divisor * pow(modulus // divisor, -1, reduced_modulus) % reduced_modulus
+    return (residue + modulus * k) % (modulus // divisor * other_modulus)
+
+
+class EndTimes:
+    """
+    A set of steps: those in `early`, which are all below `offset`, and from `offset` on,
+    every step congruent to one of `residues` modulo `period`.
+
+    `residues` are themselves steps, in [offset, offset + period).
+    """
+
+    def __init__(self, early: list[int], offset: int, period: int, residues: list[int]):
+        self.early = sorted(early)
+        self.offset = offset
+        self.period = period
+        self.residues = sorted(residues)
+
+    def __repr__(self):
+        return f"EndTimes({self.early}, {self.offset}, {self.period}, {self.residues})"
+
+    def __contains__(self, step: int) -> bool:
+        if step < self.offset:
+            return step in self.early
+        residue = (step - self.offset) % self.period + self.offset
+        return residue in self.residues
+
+    def iter_below(self, stop: int):
+        """The steps in this set that are below `stop`, in order."""
+        yield from (step for step in self.early if step < stop)
+        for cycle_start in range(0, max(stop - self.offset, 0), self.period):
+            yield from (step + cycle_start for step in self.residues if step + cycle_start < stop)
+
+    def intersection(self, other: "EndTimes") -> "EndTimes":
+        offset = max(self.offset, other.offset)
+        period = math.lcm(self.period, other.period)
+        early = [step for step in self.iter_below(offset) if step in other]
+        residues = []
+        for residue in self.residues:
+            for other_residue in other.residues:
+                step = crt(residue, self.period, other_residue, other.period)
+                if step is not None:
+                    residues.append(offset + (step - offset) % period)
+        return EndTimes(early, offset, period, residues)
+
+    def first(self) -> int | None:
+        steps = self.early or self.residues
+        return steps[0] if steps else None
+
+
 class Puzzle8Solver(Solver):
     def __init__(self, part: int = 1):
         super().__init__(8, part)
-        self.directions, self.map = self.get_input()
+        self.directions, self.names, self.successors = self.get_input()
+        self.node_index = {name: i for i, name in enumerate(self.names)}
+        # jump tables for 1, 2, 4, ... passes over the directions, extended as needed
+        self.jumps = []
 
     def process_input(self, content: str):
         direction_line, _, map_lines = content.partition("\n\n")
         direction_map = {"L": Direction.LEFT, "R": Direction.RIGHT}
-        directions = [direction_map[direction] for direction in direction_line]
-        node_map = {
-            root: (lhs, rhs)
-            for root, lhs, rhs
-            in re.findall(r"(.+) = \((.+), (.+)\)", map_lines)
-        }
-        return directions, node_map
-
-    def get_zees(self):
-        nodes = [node for node in self.map if node.endswith("A")]
-        zees = [[] for _ in nodes]
-
-        steps = 0
-
-        for direction in cycle(self.directions):
-            for i, node in enumerate(nodes):
-                if node.endswith("Z"):
-                    if len(zees[i]) < 2:
-                        zees[i].append(steps)
-
-            nodes = [self.map[node][direction] for node in nodes]
-            steps += 1
-
-            if all([len(z) == 2 for z in zees]):
-                return zees
-
-    @staticmethod
-    def iter_zees(first_z, second_z):
-        i = 0
-        while True:
-            yield first_z + (second_z - first_z) * i
-            i += 1
-
-    @staticmethod
-    def is_z(first_z, second_z, i):
-        return not (i - first_z) % (second_z - first_z)
-
-    def combine_zees(self, first_set, second_set):
-        zees = []
-        for i in self.iter_zees(*first_set):
-            if self.is_z(*second_set, i):
-                zees.append(i)
-            if len(zees) == 2:
-                return zees
+        directions = np.array([direction_map[direction] for direction in direction_line], dtype=np.intp)
+
+        rows = re.findall(r"(.+) = \((.+), (.+)\)", map_lines)
+        names = [root for root, _, _ in rows]
+        node_index = {name: i for i, name in enumerate(names)}
+        # successors[direction, node] is the node reached by going that direction from node
+        successors = np.array([
+            [node_index[lhs] for _, lhs, _ in rows],
+            [node_index[rhs] for _, _, rhs in rows],
+        ], dtype=np.intp)
+        return directions, names, successors
+
+    @cached_property
+    def is_end(self) -> np.ndarray:
+        if self.puzzle_part == 1:
+            return np.array([name == "ZZZ" for name in self.names])
+        return np.array([name.endswith("Z") for name in self.names])
+
+    @cached_property
+    def pass_table(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Where a full pass over the directions leads from each node, and every (node, step) pair
+        such that the pass from that node stands on an end node at that step, sorted by node.
+        """
+        positions = np.arange(len(self.names))
+        hit_nodes, hit_steps = [], []
+        for step, direction in enumerate(self.directions.tolist()):
+            nodes = np.flatnonzero(self.is_end[positions])
+            hit_nodes.append(nodes)
+            hit_steps.append(np.full(len(nodes), step))
+            positions = self.successors[direction, positions]
+
+        hit_nodes, hit_steps = np.concatenate(hit_nodes), np.concatenate(hit_steps)
+        order = np.argsort(hit_nodes, kind="stable")
+        return positions, hit_nodes[order], hit_steps[order]
+
+    @cached_property
+    def first_end(self) -> np.ndarray:
+        """The first step of the pass from each node that stands on an end node, or -1."""
+        _, hit_nodes, hit_steps = self.pass_table
+        first_end = np.full(len(self.names), -1)
+        nodes, first_hits = np.unique(hit_nodes, return_index=True)
+        first_end[nodes] = hit_steps[first_hits]
+        return first_end
+
+    def pass_hits(self, node: int) -> list[int]:
+        _, hit_nodes, hit_steps = self.pass_table
+        return hit_steps[np.searchsorted(hit_nodes, node):np.searchsorted(hit_nodes, node, side="right")].tolist()
+
+    def jump_levels(self, count: int) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        The first `count` jump tables: level k maps each node to where 2 ** k passes lead,
+        along with whether those passes stand on an end node.
+        """
+        if not self.jumps:
+            self.jumps.append((self.pass_table[0], self.first_end >= 0))
+        while len(self.jumps) < count:
+            jump, reaches_end = self.jumps[-1]
+            self.jumps.append((jump[jump], reaches_end | reaches_end[jump]))
+        return self.jumps[:count]
+
+    def walk(self, node: int, steps: int) -> int:
+        """The node reached after `steps` steps from `node`, in O(log(steps)) table lookups."""
+        passes, steps = divmod(steps, len(self.directions))
+        for level, (jump, _) in enumerate(self.jump_levels(passes.bit_length())):
+            if passes >> level & 1:
+                node = int(jump[node])
+        for direction in self.directions[:steps].tolist():
+            node = int(self.successors[direction, node])
+        return node
+
+    def steps_to_end(self, node: int) -> int:
+        """Steps from `node` to the first end node, found by binary lifting over whole passes."""
+        # after as many passes as there are nodes, a walk is only repeating itself
+        levels = self.jump_levels(len(self.names).bit_length())
+        passes = 0
+        for level, (jump, reaches_end) in reversed(list(enumerate(levels))):
+            if not reaches_end[node]:
+                node = int(jump[node])
+                passes += 1 << level
+        first_end = int(self.first_end[node])
+        if first_end < 0:
+            raise ValueError("no end node can be reached")
+        return passes * len(self.directions) + first_end
+
+    def lift(self, nodes: np.ndarray, passes) -> np.ndarray:
+        """Where `passes` passes lead from each of `nodes`, with one count or a count per node."""
+        passes = np.broadcast_to(passes, nodes.shape)
+        for level, (jump, _) in enumerate(self.jump_levels(int(passes.max(initial=0)).bit_length())):
+            nodes = np.where(passes >> level & 1, jump[nodes], nodes)
+        return nodes
+
+    def cycle_shapes(self, starts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The number of passes before each walk from `starts` repeats itself, and the period it
+        then repeats with, worked out for every ghost at once.
+
+        States are keyed on (node, instruction index); at pass boundaries the index is always 0.
+        """
+        jump = self.pass_table[0]
+        # after as many passes as there are nodes, every walk is on its cycle
+        on_cycle = self.lift(starts, len(self.names))
+        periods = np.zeros(len(starts), dtype=np.int64)
+        positions, passes = jump[on_cycle], 1
+        while (periods == 0).any():
+            periods[(periods == 0) & (positions == on_cycle)] = passes
+            positions, passes = jump[positions], passes + 1
+
+        # binary lifting for the last pass at which a walk and one a period ahead of it still differ
+        behind, ahead = starts, self.lift(starts, periods)
+        tails = np.zeros(len(starts), dtype=np.int64)
+        for level, (jump, _) in reversed(list(enumerate(self.jump_levels(len(self.names).bit_length())))):
+            moved_behind, moved_ahead = jump[behind], jump[ahead]
+            differ = moved_behind != moved_ahead
+            behind = np.where(differ, moved_behind, behind)
+            ahead = np.where(differ, moved_ahead, ahead)
+            tails += differ << level
+        return tails + (behind != ahead), periods
+
+    def end_times(self, starts: np.ndarray) -> list[EndTimes]:
+        """Every step on which each ghost's walk stands on an end node, with all ghosts walked together."""
+        tails, periods = self.cycle_shapes(starts)
+        jump, hit_nodes, _ = self.pass_table
+        has_hits = np.zeros(len(self.names), dtype=bool)
+        has_hits[hit_nodes] = True
+
+        pass_length = len(self.directions)
+        early, residues = [[] for _ in starts], [[] for _ in starts]
+        positions = starts
+        for passes in range(int((tails + periods).max(initial=0))):
+            for ghost in np.flatnonzero(has_hits[positions] & (passes < tails + periods)).tolist():
+                times = [passes * pass_length + step for step in self.pass_hits(int(positions[ghost]))]
+                (early if passes < tails[ghost] else residues)[ghost].extend(times)
+            positions = jump[positions]
+        return [
+            EndTimes(*args)
+            for args in zip(early, (tails * pass_length).tolist(), (periods * pass_length).tolist(), residues)
+        ]
 
     def solve(self):
         if self.puzzle_part == 1:
-            node = "AAA"
-            end_node = "ZZZ"
-
-            steps = 0
-
-            for direction in cycle(self.directions):
-                if node == end_node:
-                    return steps
-
-                node = self.map[node][direction]
-                steps += 1
+            return self.steps_to_end(self.node_index["AAA"])
         else:
-            zees = self.get_zees()
-            return reduce(
-                self.combine_zees,
-                zees,
-            )[0]
-
+            starts = np.array([i for i, name in enumerate(self.names) if name.endswith("A")])
+            first = reduce(EndTimes.intersection, self.end_times(starts)).first()
+            if first is None:
+                raise ValueError("the ghosts never all stand on end nodes at once")
+            return first
@@ -1,46 +1,90 @@
+from collections.abc import Iterator
+from functools import cache
+from math import comb
+
 import numpy as np
 
+from numeric_parsing import INT64_MAX, MAX_INT64_DIGITS, as_bytes, parse_integers
 from solver import Solver
 
 
+@cache
+def extrapolation_weights(length: int, backwards: bool = False) -> tuple[int, ...]:
+    """
+    Signed binomial weights w such that w . values is the value after a sequence of `length`
+    values, or before it if `backwards`, found by extending its difference table.
+
+    These are the Lagrange weights for extrapolating the polynomial of degree below `length`
+    through the values.
+    """
+    if backwards:
+        return tuple((-1) ** k * comb(length, k + 1) for k in range(length))
+    return tuple((-1) ** (length - 1 - k) * comb(length, k) for k in range(length))
+
+
+def extrapolate(values: np.ndarray, backwards: bool = False) -> int:
+    """Sum of the extrapolated values of every row of a matrix of sequences, exactly."""
+    weights = extrapolation_weights(values.shape[1], backwards)
+    if values.dtype != object:
+        # np.abs wraps around on the smallest int64, so take the largest magnitude as Python ints
+        largest = max(-int(values.min(initial=0)), int(values.max(initial=0)))
+        bound = largest * sum(map(abs, weights)) * len(values)
+        if bound <= INT64_MAX:
+            return int((values @ np.array(weights, dtype=np.int64)).sum())
+    # Python ints never overflow
+    return sum((values.astype(object) @ np.array(weights, dtype=object)).tolist())
+
+
 class Sequence:
 
     def __init__(self, values):
-        self.values = np.array([int(x) for x in values], dtype=int)
+        values = [int(x) for x in values]
+        # left to itself numpy would turn values just past an int64 into inexact floats
+        fits = all(-INT64_MAX - 1 <= x <= INT64_MAX for x in values)
+        self.values = np.array(values, dtype=np.int64 if fits else object)
 
     def __repr__(self):
         return f"Sequence([{', '.join(str(x) for x in self.values)}])"
 
-    def get_dx(self) -> "Sequence":
-        return Sequence(self.values[1:] - self.values[:-1])
-
-    def apply_dx(self) -> int:
-        return self.values[-1] + self.get_dx().get_next()
-
     def get_next(self) -> int:
-        if not any(self.values):
-            return 0
-        return self.apply_dx()
-
-    def apply_dx_backwards(self) -> int:
-        return self.values[0] - self.get_dx().get_previous()
+        return extrapolate(self.values[None, :])
 
     def get_previous(self) -> int:
-        if not any(self.values):
-            return 0
-        return self.apply_dx_backwards()
+        return extrapolate(self.values[None, :], backwards=True)
 
 
 class Puzzle9Solver(Solver):
     def __init__(self, part: int = 1):
         super().__init__(9, part)
-        self.sequences = self.get_input()
 
-    def process_input(self, content: str):
-        return [Sequence(line.split()) for line in content.splitlines()]
+    def process_input(self, chunks: Iterator[str]) -> Iterator[dict[int, np.ndarray]]:
+        return map(self.group_by_length, chunks)
+
+    @staticmethod
+    def group_by_length(content: str) -> dict[int, np.ndarray]:
+        """The sequences of each length, as the rows of one matrix."""
+        buffer = as_bytes(content)
+        values, starts, ends = parse_integers(buffer, signed=True)
+        if (ends - starts > MAX_INT64_DIGITS).any():
+            rows = [[int(x) for x in line.split()] for line in content.splitlines()]
+            return {
+                length: np.array([row for row in rows if len(row) == length], dtype=object)
+                for length in sorted({len(row) for row in rows})
+            }
+
+        line_numbers = np.searchsorted(np.flatnonzero(buffer == ord("\n")), starts)
+        line_lengths = np.bincount(line_numbers)
+        # each line's numbers are contiguous, so a length's numbers reshape into its rows
+        lengths_by_number = line_lengths[line_numbers]
+        return {
+            int(length): values[lengths_by_number == length].reshape(-1, length)
+            for length in np.unique(line_lengths[line_lengths > 0])
+        }
 
     def solve(self):
-        if self.puzzle_part == 1:
-            return sum(seq.get_next() for seq in self.sequences)
-        else:
-            return sum(seq.get_previous() for seq in self.sequences)
+        backwards = self.puzzle_part == 2
+        return sum(
+            extrapolate(group, backwards)
+            for groups in self.stream_input(by_line=False)
+            for group in groups.values()
+        )
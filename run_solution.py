@@ -1,19 +1,210 @@
+import argparse
 import importlib
+import json
+import multiprocessing
+import os
+import re
+import time
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import NamedTuple
 
-from solver import Solver
+from solver import PROFILE_ENV, Solver, get_profilers
 
 
-def get_solver(problem_number: int, part: int = 1) -> Solver:
+PUZZLE_DIR = Path(__file__).parent
+
+
+class SolutionResult(NamedTuple):
+    problem_number: int
+    part: int
+    status: str
+    answer: object = None
+    wall_time: float = 0.0
+    fetch_time: float = 0.0
+    parse_time: float = 0.0
+    solve_time: float = 0.0
+    error: str | None = None
+    profile: dict | None = None
+
+
+def get_solver_class(problem_number: int) -> type[Solver]:
     module_name = f"puzzle_{problem_number}"
     solver_name = f"Puzzle{problem_number}Solver"
-    return getattr(importlib.import_module(module_name), solver_name)(part)
+    return getattr(importlib.import_module(module_name), solver_name)
+
+
+def get_solver(problem_number: int, part: int = 1) -> Solver:
+    return get_solver_class(problem_number)(part)
 
 
 def run_solution(problem_number: int, part: int = 1):
-    return get_solver(problem_number, part).solve()
+    return get_solver(problem_number, part).run()
+
+
+def find_puzzles() -> list[int]:
+    return sorted(
+        int(match.group(1))
+        for path in PUZZLE_DIR.glob("puzzle_*.py")
+        if (match := re.fullmatch(r"puzzle_(\d+)\.py", path.name))
+    )
+
+
+def time_solution(problem_number: int, part: int = 1) -> SolutionResult:
+    start = time.perf_counter()
+    solver = get_solver(problem_number, part)
+    answer = solver.run()
+    return SolutionResult(
+        problem_number,
+        part,
+        "ok",
+        answer,
+        wall_time=time.perf_counter() - start,
+        fetch_time=solver.phase_times["fetch"],
+        parse_time=solver.phase_times["process_input"],
+        solve_time=solver.phase_times["solve"],
+        profile=solver.profile_report(),
+    )
+
+
+def _run_task(connection, problem_number: int, part: int):
+    start = time.perf_counter()
+    try:
+        result = time_solution(problem_number, part)
+    except Exception as e:
+        result = SolutionResult(
+            problem_number, part, "error", wall_time=time.perf_counter() - start, error=repr(e)
+        )
+    connection.send(result)
+    connection.close()
+
+
+def run_batch(
+    problems: list[tuple[int, int]] | None = None,
+    workers: int | None = None,
+    timeout: float | None = None,
+    fail_fast: bool = False,
+) -> list[SolutionResult]:
+    """
+    Run every (problem, part) pair in its own worker process, at most `workers` at a time.
+
+    Tasks running longer than `timeout` seconds are killed and reported as timed out. With
+    `fail_fast`, the first error or timeout stops the sweep and every unfinished task is
+    reported as cancelled.
+    """
+    if problems is None:
+        problems = [(problem, part) for problem in find_puzzles() for part in (1, 2)]
+    workers = workers or os.cpu_count() or 1
+
+    pending = list(reversed(problems))
+    running = {}
+    results = {}
+    failed = False
+
+    def finish(connection, result):
+        process, _, _ = running.pop(connection)
+        process.join()
+        connection.close()
+        results[result.problem_number, result.part] = result
+
+    while (pending and not failed) or running:
+        while pending and not failed and len(running) < workers:
+            problem_number, part = pending.pop()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_run_task, args=(sender, problem_number, part), daemon=True
+            )
+            process.start()
+            sender.close()
+            running[receiver] = (process, (problem_number, part), time.perf_counter())
+
+        deadlines = [started + timeout for _, _, started in running.values()] if timeout else []
+        wait_time = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+        for connection in wait(list(running), timeout=wait_time):
+            process, (problem_number, part), started = running[connection]
+            try:
+                result = connection.recv()
+            except EOFError:
+                result = SolutionResult(
+                    problem_number,
+                    part,
+                    "error",
+                    wall_time=time.perf_counter() - started,
+                    error=f"worker exited with code {process.exitcode}",
+                )
+            finish(connection, result)
+            failed = failed or (fail_fast and result.status != "ok")
+
+        now = time.perf_counter()
+        for connection, (process, (problem_number, part), started) in list(running.items()):
+            timed_out = timeout is not None and now - started >= timeout
+            if timed_out or failed:
+                process.kill()
+                finish(connection, SolutionResult(
+                    problem_number, part, "timeout" if timed_out else "cancelled", wall_time=now - started
+                ))
+                failed = failed or fail_fast
+
+    for problem_number, part in pending:
+        results[problem_number, part] = SolutionResult(problem_number, part, "cancelled")
+
+    return [results[problem] for problem in problems]
+
+
+def format_results(results: list[SolutionResult]) -> str:
+    header = ("puzzle", "status", "answer", "wall (s)", "fetch (s)", "parse (s)", "solve (s)")
+    rows = [
+        (
+            f"{result.problem_number}.{result.part}",
+            result.status,
+            str(result.answer) if result.status == "ok" else result.error or "",
+            f"{result.wall_time:.4f}",
+            f"{result.fetch_time:.4f}",
+            f"{result.parse_time:.4f}",
+            f"{result.solve_time:.4f}",
+        )
+        for result in results
+    ]
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in [header, *rows]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Advent of Code 2023 solutions.")
+    parser.add_argument("problem", nargs="?", type=int, default=11)
+    parser.add_argument("part", nargs="?", type=int, default=2)
+    parser.add_argument("--all", action="store_true", help="run every puzzle and part in a process pool")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--timeout", type=float, default=None, help="per-task timeout in seconds")
+    parser.add_argument("--fail-fast", action="store_true", help="stop the sweep at the first failure")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile,tracemalloc",
+        default=None,
+        help="profile each phase (optionally only 'cprofile' or 'tracemalloc') and print JSON reports",
+    )
+    args = parser.parse_args()
+
+    if args.profile:
+        # set in the environment so that batch worker processes pick it up too
+        os.environ[PROFILE_ENV] = args.profile
+
+    if args.all:
+        results = run_batch(workers=args.workers, timeout=args.timeout, fail_fast=args.fail_fast)
+    else:
+        results = [time_solution(args.problem, args.part)]
+
+    if get_profilers():
+        print(json.dumps([result._asdict() for result in results], indent=2, default=str))
+    elif args.all:
+        print(format_results(results))
+    else:
+        print(f"Solution to Problem {args.problem}.{args.part}: {results[0].answer}")
 
 
 if __name__ == '__main__':
-    problem = (11, 2)
-    answer = run_solution(*problem)
-    print(f"Solution to Problem {problem[0]}.{problem[1]}: {answer}")
+    main()
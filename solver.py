@@ -1,5 +1,57 @@
 import abc
-from aocd import get_data
+import io
+import os
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TextIO
+
+from input_cache import YEAR, input_path, load_input
+
+
+# Comma-separated profilers to run around every phase: "cprofile", "tracemalloc", or "1" for both.
+PROFILE_ENV = "AOC23_PROFILE"
+PROFILERS = ("cprofile", "tracemalloc")
+# Number of functions kept in the cProfile summary.
+PROFILE_TOP_N = 25
+# Characters read from the input at a time when it is streamed.
+CHUNK_SIZE = 1 << 16
+
+_EXHAUSTED = object()
+
+
+def get_profilers() -> set[str]:
+    requested = {name.strip().lower() for name in os.environ.get(PROFILE_ENV, "").split(",")}
+    if requested & {"1", "true", "all"}:
+        return set(PROFILERS)
+    return requested & set(PROFILERS)
+
+
+def iter_chunks(source: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Read `source` in pieces of whole lines, closing it at the end.
+
+    Pieces don't end in a newline, and trailing newlines at the end of the input are dropped,
+    like load_input does.
+    """
+    with source:
+        pending = ""
+        for data in iter(lambda: source.read(chunk_size), ""):
+            pending += data
+            # trailing newlines are held back, since they may turn out to end the input
+            last_newline = pending.rfind("\n", 0, len(pending.rstrip("\n")))
+            if last_newline >= 0:
+                yield pending[:last_newline]
+                pending = pending[last_newline + 1:]
+        if pending := pending.rstrip("\r\n"):
+            yield pending
+
+
+def iter_lines(chunks: Iterator[str]) -> Iterator[str]:
+    for chunk in chunks:
+        yield from chunk.split("\n")
 
 
 class Solver:
@@ -7,14 +59,110 @@ class Solver:
     def __init__(self, puzzle_number: int, puzzle_part: int):
         self.puzzle_number = puzzle_number
         self.puzzle_part = puzzle_part
+        self.profilers = get_profilers()
+        # exclusive seconds and peak traced bytes per phase; nested phases are not counted twice
+        self.phase_times = defaultdict(float)
+        self.phase_peaks = defaultdict(int)
+        self._phase_stack = []
+        self._profile = None
+        if "cprofile" in self.profilers:
+            # cProfile and pstats add noticeably to import time, so only load them when asked
+            import cProfile
+
+            self._profile = cProfile.Profile()
 
     @property
     def puzzle_str(self):
         return f"puzzle_{self.puzzle_number}"
 
+    @property
+    def parse_time(self) -> float:
+        return self.phase_times["process_input"]
+
+    @contextmanager
+    def phase(self, name: str):
+        """Attribute the time (and, when profiling, memory) spent in the block to `name`."""
+        outermost = not self._phase_stack
+        tracing = "tracemalloc" in self.profilers
+        started_tracing = tracing and outermost and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if outermost and self._profile is not None:
+            self._profile.enable()
+        if tracing:
+            if not outermost:
+                parent = self._phase_stack[-1]
+                parent["peak"] = max(parent["peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        frame = {"children": 0.0, "peak": 0}
+        self._phase_stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._phase_stack.pop()
+            self.phase_times[name] += elapsed - frame["children"]
+            if self._phase_stack:
+                self._phase_stack[-1]["children"] += elapsed
+
+            if tracing:
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                self.phase_peaks[name] = max(self.phase_peaks[name], peak)
+                if self._phase_stack:
+                    self._phase_stack[-1]["peak"] = max(self._phase_stack[-1]["peak"], peak)
+            if outermost and self._profile is not None:
+                self._profile.disable()
+            if started_tracing:
+                tracemalloc.stop()
+
     def get_input(self):
-        content = get_data(year=2023, day=self.puzzle_number)
-        return self.process_input(content)
+        with self.phase("fetch"):
+            content = load_input(YEAR, self.puzzle_number)
+        with self.phase("process_input"):
+            return self.process_input(content)
+
+    def open_input(self) -> TextIO:
+        """The input as a readable stream, from disk when it is stored locally."""
+        if (path := input_path(YEAR, self.puzzle_number)) is not None:
+            return path.open()
+        return io.StringIO(load_input(YEAR, self.puzzle_number))
+
+    def stream_input(self, by_line: bool = True):
+        """
+        Like get_input, but process_input gets an iterator over the input's lines, or over
+        chunks of whole lines, which is read as it is consumed.
+
+        When process_input and solve are generators, the input never has to be in memory all at
+        once, and the reading and processing they do on demand is still timed as those phases.
+        """
+        with self.phase("fetch"):
+            chunks = self.timed_iter("fetch", iter_chunks(self.open_input()))
+        with self.phase("process_input"):
+            processed = self.process_input(iter_lines(chunks) if by_line else chunks)
+        if isinstance(processed, Iterator):
+            return self.timed_iter("process_input", processed)
+        return processed
+
+    def timed_iter(self, name: str, items: Iterator) -> Iterator:
+        """Iterate over `items`, attributing the time each one takes to produce to phase `name`."""
+        while True:
+            with self.phase(name):
+                item = next(items, _EXHAUSTED)
+            if item is _EXHAUSTED:
+                return
+            yield item
+
+    def get_grid(self):
+        """The input as a Grid, mapped straight from disk when possible, then processed."""
+        # grid loads numpy, which not every solver needs
+        from grid import Grid
+
+        with self.phase("fetch"):
+            grid = Grid.load(YEAR, self.puzzle_number)
+        with self.phase("process_input"):
+            return self.process_input(grid)
 
     def process_input(self, content: str):
         return content
@@ -22,3 +170,35 @@ class Solver:
     @abc.abstractmethod
     def solve(self):
         """Solution to the puzzle."""
+
+    def run(self):
+        """Solve the puzzle, timing it as the "solve" phase."""
+        with self.phase("solve"):
+            return self.solve()
+
+    def profile_report(self) -> dict:
+        """JSON-serializable summary of the phases run so far."""
+        report = {
+            "puzzle": self.puzzle_number,
+            "part": self.puzzle_part,
+            "phases": {
+                name: {"seconds": seconds}
+                | ({"peak_bytes": self.phase_peaks[name]} if "tracemalloc" in self.profilers else {})
+                for name, seconds in self.phase_times.items()
+            },
+        }
+        if self._profile is not None:
+            import pstats
+
+            stats = pstats.Stats(self._profile)
+            top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+            report["profile"] = [
+                {
+                    "function": f"{filename}:{line}({function})",
+                    "calls": calls,
+                    "tottime": tottime,
+                    "cumtime": cumtime,
+                }
+                for (filename, line, function), (_, calls, tottime, cumtime, _) in top[:PROFILE_TOP_N]
+            ]
+        return report
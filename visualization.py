@@ -0,0 +1,83 @@
+"""Plotting helpers. Importing this module loads matplotlib, so solvers only import it on demand."""
+from collections.abc import Iterable, Iterator
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import animation
+
+
+COLORS = {
+    "background": (255, 255, 255),
+    "outside": (214, 228, 240),
+    "inside": (240, 200, 80),
+    "loop": (200, 40, 40),
+}
+
+
+def render_grid(loop_mask: np.ndarray, inside_mask: np.ndarray | None = None,
+                outside_mask: np.ndarray | None = None) -> np.ndarray:
+    """An (h, w, 3) uint8 RGB image of a grid, one pixel per tile, colored by the masks given."""
+    image = np.empty((*loop_mask.shape, 3), dtype=np.uint8)
+    image[...] = COLORS["background"]
+    # later masks are drawn over earlier ones
+    for name, mask in (("outside", outside_mask), ("inside", inside_mask), ("loop", loop_mask)):
+        if mask is not None:
+            image[mask] = COLORS[name]
+    return image
+
+
+def draw_grid(loop_mask: np.ndarray, inside_mask: np.ndarray | None = None,
+              outside_mask: np.ndarray | None = None):
+    fig, ax = plt.subplots()
+    ax.imshow(render_grid(loop_mask, inside_mask, outside_mask), interpolation="nearest")
+    ax.set_axis_off()
+    plt.show()
+
+
+def save_animation(frames: Iterable[np.ndarray], path: str, fps: int = 30, dpi: int = 100,
+                   writer: animation.AbstractMovieWriter | None = None):
+    """
+    Write RGB frames to a movie file as they are produced.
+
+    Each frame is drawn into the same image and handed straight to the writer, so memory doesn't
+    grow with the number of frames. The default writer pipes frames to ffmpeg.
+    """
+    frames = iter(frames)
+    first_frame = next(frames)
+    writer = writer or animation.FFMpegWriter(fps=fps)
+
+    height, width = first_frame.shape[:2]
+    fig = plt.figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.set_axis_off()
+    image = ax.imshow(first_frame, interpolation="nearest")
+    try:
+        with writer.saving(fig, path, dpi):
+            writer.grab_frame()
+            for frame in frames:
+                image.set_data(frame)
+                writer.grab_frame()
+    finally:
+        plt.close(fig)
+
+
+def loop_frames(loop_order: np.ndarray, inside_mask: np.ndarray,
+                frame_count: int) -> Iterator[np.ndarray]:
+    """
+    Frames of a loop being traced and then filled in, rendered one at a time.
+
+    `loop_order` holds the step on which the loop reaches each tile, or -1. The first half of the
+    frames trace the loop; the second fill the inside row by row.
+    """
+    trace_frames = max(1, frame_count // 2)
+    fill_frames = max(1, frame_count - trace_frames)
+    loop_length = int(loop_order.max()) + 1
+
+    for frame in range(1, trace_frames + 1):
+        yield render_grid((loop_order >= 0) & (loop_order < loop_length * frame // trace_frames))
+
+    loop_mask = loop_order >= 0
+    rows = np.arange(len(inside_mask))[:, None]
+    for frame in range(1, fill_frames + 1):
+        filled_rows = len(inside_mask) * frame // fill_frames
+        yield render_grid(loop_mask, inside_mask & (rows < filled_rows))